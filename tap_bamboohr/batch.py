@@ -0,0 +1,202 @@
+"""Parquet batch files of records, referenced by BATCH messages."""
+from __future__ import annotations
+
+import json
+import typing as t
+from dataclasses import dataclass
+from datetime import date, datetime
+from uuid import uuid4
+
+from singer_sdk.batch import BaseBatcher, lazy_chunked_generator
+from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+
+if t.TYPE_CHECKING:
+    import pyarrow as pa
+
+Converter = t.Callable[[t.Any], t.Any]
+ArrowColumn = t.Tuple["pa.DataType", t.Optional[Converter]]
+
+
+@dataclass
+class ParquetEncoding(BaseBatchFileEncoding):
+    """Parquet encoding for batch files.
+
+    Registered with the SDK as the `parquet` format of `batch_config`, along with
+    its `jsonl` format.
+    """
+
+    __encoding_format__ = "parquet"
+
+
+def import_pyarrow() -> t.Any:
+    """Return the pyarrow module, with its Parquet support imported."""
+    try:
+        import pyarrow
+        import pyarrow.parquet  # noqa: F401
+    except ImportError:
+        raise ValueError(
+            "The `parquet` batch encoding requires the pyarrow package, "
+            "installed with `pip install tap-bamboohr[parquet]`."
+        ) from None
+    return pyarrow
+
+
+def json_types(schema: dict) -> t.List[str]:
+    """Return the non-null JSON types of a schema."""
+    types = schema.get("type", [])
+    if isinstance(types, str):
+        types = [types]
+    return [json_type for json_type in types if json_type != "null"]
+
+
+def parse_datetime(value: t.Any) -> t.Any:
+    """Parse a date-time string, as output by the streams, into a datetime."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+    return value
+
+
+def parse_date(value: t.Any) -> t.Any:
+    """Parse the date of a date or date-time string into a date."""
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def to_string(value: t.Any) -> t.Any:
+    """Return strings and nulls as they are, and other values as JSON."""
+    if value is None or isinstance(value, str):
+        return value
+    return json.dumps(value)
+
+
+def string_column(arrow: t.Any, schema: dict) -> ArrowColumn:
+    """Return a string column, holding the JSON of values that are not strings."""
+    return arrow.string(), to_string
+
+
+def object_column(arrow: t.Any, schema: dict) -> ArrowColumn:
+    """Return a struct column of the properties of an object schema."""
+    if not schema.get("properties"):
+        return string_column(arrow, schema)
+    fields = {
+        name: arrow_column(property_schema)
+        for name, property_schema in schema["properties"].items()
+    }
+    converters = {name: convert for name, (_, convert) in fields.items() if convert}
+
+    def convert_object(value: t.Any) -> t.Any:
+        if not isinstance(value, dict):
+            return value
+        return {
+            name: converters[name](item)
+            if name in converters and item is not None
+            else item
+            for name, item in value.items()
+        }
+
+    struct = arrow.struct(
+        [arrow.field(name, type_) for name, (type_, _) in fields.items()]
+    )
+    return struct, convert_object if converters else None
+
+
+def array_column(arrow: t.Any, schema: dict) -> ArrowColumn:
+    """Return a list column of the items of an array schema."""
+    if not schema.get("items"):
+        return string_column(arrow, schema)
+    item_type, convert_item = arrow_column(schema["items"])
+    if convert_item is None:
+        return arrow.list_(item_type), None
+    return arrow.list_(item_type), lambda value: [
+        None if item is None else convert_item(item) for item in value
+    ]
+
+
+#: Arrow columns by JSON type, and format of strings. Other schemas are strings.
+ARROW_COLUMNS: t.Dict[
+    t.Tuple[str, t.Optional[str]], t.Callable[[t.Any, dict], ArrowColumn]
+] = {
+    ("boolean", None): lambda arrow, _: (arrow.bool_(), None),
+    ("integer", None): lambda arrow, _: (arrow.int64(), None),
+    ("number", None): lambda arrow, _: (arrow.float64(), None),
+    ("string", "date-time"): lambda arrow, _: (
+        arrow.timestamp("us", tz="UTC"),
+        parse_datetime,
+    ),
+    ("string", "date"): lambda arrow, _: (arrow.date32(), parse_date),
+    ("object", None): object_column,
+    ("array", None): array_column,
+}
+
+
+def arrow_column(schema: dict) -> ArrowColumn:
+    """Return the Arrow type of a JSON schema, and how to convert its values.
+
+    Objects with properties become structs and arrays with items become lists.
+    Properties with several types, or none, become strings holding their JSON.
+    """
+    types = json_types(schema)
+    if len(types) != 1:
+        return string_column(import_pyarrow(), schema)
+    key = (types[0], schema.get("format") if types[0] == "string" else None)
+    return ARROW_COLUMNS.get(key, string_column)(import_pyarrow(), schema)
+
+
+class ParquetBatcher(BaseBatcher):
+    """Writes records to Parquet files of `batch_size` rows, with typed columns.
+
+    Columns are typed from the stream's schema, see `arrow_column`, and only hold
+    the given properties. Files are compressed with the encoding's compression,
+    Snappy by default.
+    """
+
+    def __init__(
+        self,
+        tap_name: str,
+        stream_name: str,
+        batch_config: BatchConfig,
+        schema: dict,
+        properties: t.Iterable[str],
+    ) -> None:
+        """Type the columns of `properties` from the stream's `schema`."""
+        super().__init__(tap_name, stream_name, batch_config)
+        self.pa = import_pyarrow()
+        self.columns = {
+            name: arrow_column(schema["properties"][name]) for name in properties
+        }
+        self.arrow_schema = self.pa.schema(
+            [self.pa.field(name, type_) for name, (type_, _) in self.columns.items()]
+        )
+
+    def record_batch(self, records: t.Iterable[dict]) -> pa.RecordBatch:
+        """Return the columns of `records` as an Arrow record batch."""
+        values: t.Dict[str, list] = {name: [] for name in self.columns}
+        appends = [(name, values[name].append) for name in self.columns]
+        for record in records:
+            get = record.get
+            for name, append in appends:
+                append(get(name))
+        arrays = []
+        for name, (type_, convert) in self.columns.items():
+            column = values[name]
+            if convert is not None:
+                column = [None if value is None else convert(value) for value in column]
+            arrays.append(self.pa.array(column, type=type_))
+        return self.pa.RecordBatch.from_arrays(arrays, schema=self.arrow_schema)
+
+    def get_batches(self, records: t.Iterator[dict]) -> t.Iterator[t.List[str]]:
+        """Yield the manifest of each Parquet file written."""
+        sync_id = f"{self.tap_name}--{self.stream_name}-{uuid4()}"
+        prefix = self.batch_config.storage.prefix or ""
+        compression = self.batch_config.encoding.compression or "snappy"
+        for index, chunk in enumerate(
+            lazy_chunked_generator(records, self.batch_config.batch_size), start=1
+        ):
+            table = self.pa.Table.from_batches([self.record_batch(chunk)])
+            filename = f"{prefix}{sync_id}-{index}.parquet"
+            with self.batch_config.storage.fs(create=True) as fs:
+                with fs.open(filename, "wb") as file:
+                    self.pa.parquet.write_table(table, file, compression=compression)
+                file_url = fs.geturl(filename)
+            yield [file_url]
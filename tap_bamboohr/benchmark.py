@@ -0,0 +1,393 @@
+"""Offline benchmark of full syncs against synthetic BambooHR accounts.
+
+Run with `python -m tap_bamboohr.benchmark`, e.g.::
+
+    python -m tap_bamboohr.benchmark --employees 100 10000 --report-fields 200
+
+Each account size is synced in a fresh process, so that the peak memory reported
+for one size is not inflated by the sizes synced before it.
+
+With `--standardize`, the time taken to standardize the rows of a custom report
+is measured instead, without requests or output.
+
+With `--schemas`, the time taken to build the schema of a custom report, and to
+read it once built, is measured instead.
+
+With `--startup`, the time taken to start the tap and run discovery is measured
+instead, with and without the discovery cache.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import typing as t
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_bamboohr.jsonpath import compile_jsonpath
+from tap_bamboohr.streams import TapBambooHRStream, get_field_types
+
+#: Prefix of the RECORD messages written by the SDK, giving the stream name.
+RECORD_PREFIX = re.compile(r'\{"type": ?"RECORD", ?"stream": ?"((?:[^"\\]|\\.)*)"')
+
+
+def report_fields(count: int) -> t.List[str]:
+    """Return `count` custom report fields: known fields, then custom field ids."""
+    fields = ["id", *(field for field in get_field_types() if field != "id")]
+    custom_field_id = 4000
+    while len(fields) < count:
+        fields.append(str(custom_field_id))
+        custom_field_id += 1
+    return fields[:count]
+
+
+def benchmark_config(
+    employees: int, fields: int, settings: t.Optional[dict] = None
+) -> dict:
+    """Return the tap config syncing a synthetic account of the given size."""
+    config = {
+        "auth_token": "benchmark",
+        "subdomain": "benchmark",
+        "synthetic_employees": employees,
+        "custom_reports": [
+            {"name": "benchmark_report", "fields": report_fields(fields)}
+        ],
+        "record_timings": True,
+    }
+    config.update(settings or {})
+    return config
+
+
+class CountingWriter:
+    """Text stream discarding Singer messages, counting records per stream."""
+
+    def __init__(self) -> None:
+        self.records: t.Counter[str] = Counter()
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text)
+        for line in text.splitlines():
+            match = RECORD_PREFIX.match(line)
+            if match:
+                self.records[json.loads(f'"{match.group(1)}"')] += 1
+            elif '"RECORD"' in line:
+                message = json.loads(line)
+                if message.get("type") == "RECORD":
+                    self.records[message["stream"]] += 1
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def peak_rss_bytes() -> t.Optional[int]:
+    """Return the peak resident memory of this process, if the OS reports it."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_sync(config: dict) -> dict:
+    """Run a full sync of the tap with `config` and return its measurements.
+
+    Wall time is measured for each top-level stream, including the child streams
+    it syncs, so it is None for child streams. The time each stream spent in each
+    phase of its sync is included too.
+    """
+    from tap_bamboohr.tap import TapBambooHR
+
+    tap = TapBambooHR(config=config, parse_env_config=False, validate_config=True)
+    writer = CountingWriter()
+    stdout = sys.stdout
+    sys.stdout = writer  # type: ignore[assignment]
+    start = time.perf_counter()
+    try:
+        tap.sync_all()
+    finally:
+        seconds = time.perf_counter() - start
+        sys.stdout = stdout
+
+    timings = {
+        stream.name: t.cast(TapBambooHRStream, stream).timings.to_dict()
+        for stream in tap.streams.values()
+    }
+    stream_seconds = tap.sync_seconds
+    rows = sum(writer.records.values())
+    return {
+        "employees": config["synthetic_employees"],
+        "seconds": round(seconds, 3),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds) if seconds else None,
+        "output_bytes": writer.bytes,
+        "peak_rss_bytes": peak_rss_bytes(),
+        "streams": {
+            name: {
+                "rows": writer.records[name],
+                "seconds": round(stream_seconds[name], 3)
+                if name in stream_seconds
+                else None,
+                "timings": timings.get(name),
+            }
+            for name in sorted(set(writer.records) | set(stream_seconds))
+        },
+    }
+
+
+def run_isolated(config: dict) -> dict:
+    """Run `run_sync` in a fresh process."""
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(run_sync, config).result()
+
+
+def benchmark_extractors(employees: int, fields: int) -> t.Iterator[dict]:
+    """Time the SDK's `extract_jsonpath` and `compile_jsonpath` on large payloads.
+
+    Yields the timings of each expression.
+    """
+    report = {
+        "fields": [{"id": field} for field in report_fields(fields)],
+        "employees": [
+            {field: f"{field} {index}" for field in report_fields(fields)}
+            for index in range(employees)
+        ],
+    }
+    lists = [
+        {"alias": f"list{index}", "options": [{"id": option} for option in range(50)]}
+        for index in range(employees // 50 + 1)
+    ]
+    lists[-1]["alias"] = "jobTitle"
+    cases = [
+        ("$.employees[*]", report),
+        ("$.fields[*].id", report),
+        ("$[*]", report["employees"]),
+        ("$[?(@.alias=='jobTitle')].options[*]", lists),
+    ]
+    for expression, document in cases:
+        seconds = {}
+        for name, extract in [
+            (
+                "extract_jsonpath",
+                lambda document: extract_jsonpath(expression, document),
+            ),
+            ("compile_jsonpath", compile_jsonpath(expression)),
+        ]:
+            start = time.perf_counter()
+            matches = sum(1 for _ in extract(document))
+            seconds[name] = time.perf_counter() - start
+        yield {
+            "expression": expression,
+            "matches": matches,
+            **{f"{name}_seconds": round(value, 4) for name, value in seconds.items()},
+            "speedup": round(
+                seconds["extract_jsonpath"] / max(seconds["compile_jsonpath"], 1e-9), 1
+            ),
+        }
+
+
+def benchmark_standardize(employees: int, fields: int) -> dict:
+    """Time `standardize_data` on the rows of a custom report with `fields` fields.
+
+    A third of the date values are the placeholders BambooHR uses for empty dates,
+    and boolean values are the strings BambooHR returns.
+    """
+    from tap_bamboohr.tap import TapBambooHR
+
+    tap = TapBambooHR(
+        config=benchmark_config(employees, fields),
+        parse_env_config=False,
+        validate_config=True,
+    )
+    stream = t.cast(TapBambooHRStream, tap.streams["benchmark_report"])
+    temporal_fields = stream.temporal_fields
+    boolean_fields = stream.boolean_fields
+
+    def value(field: str, index: int) -> t.Any:
+        if field in boolean_fields:
+            return "true" if index % 2 else "false"
+        if field in temporal_fields:
+            return "0000-00-00" if index % 3 == 0 else "2024-01-02"
+        return f"{field} {index}"
+
+    rows = [
+        {field: value(field, index) for field in stream.schema["properties"]}
+        for index in range(employees)
+    ]
+    start = time.perf_counter()
+    for row in rows:
+        stream.standardize_data(row)
+    seconds = time.perf_counter() - start
+    return {
+        "rows": employees,
+        "fields": len(stream.schema["properties"]),
+        "converted_fields": len(stream.field_converters),
+        "seconds": round(seconds, 4),
+        "rows_per_second": round(employees / seconds) if seconds else None,
+    }
+
+
+def benchmark_schemas(fields: int, reads: int = 100_000) -> dict:
+    """Time building the schema and converters of a custom report, and reading them.
+
+    Reads are timed as the SDK does them for every record, so their cost is the
+    schema overhead per record.
+    """
+    from tap_bamboohr.streams import CustomReport
+    from tap_bamboohr.tap import TapBambooHR
+
+    config = benchmark_config(1, fields)
+    tap = TapBambooHR(config=config, parse_env_config=False, validate_config=True)
+    start = time.perf_counter()
+    stream = CustomReport(
+        tap=tap,
+        name="benchmark_schemas",
+        custom_report_config=config["custom_reports"][0],
+    )
+    stream.schema
+    stream.field_converters
+    build_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(reads):
+        stream.schema
+        stream.field_converters
+    read_seconds = time.perf_counter() - start
+    return {
+        "fields": fields,
+        "build_seconds": round(build_seconds, 4),
+        "read_nanoseconds": round(read_seconds / reads * 1e9),
+    }
+
+
+def time_command(args: t.List[str], runs: int) -> float:
+    """Return the median wall time of running a Python command in fresh processes."""
+    seconds = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, *args],
+            check=True,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+        seconds.append(time.perf_counter() - start)
+    return statistics.median(seconds)
+
+
+def benchmark_startup(config: dict, runs: int) -> dict:
+    """Time importing the tap and running discovery in fresh processes.
+
+    Discovery is timed without the discovery cache, and with a warm one.
+    """
+    discover = ["-c", "from tap_bamboohr.tap import cli; cli()", "--discover"]
+    with tempfile.TemporaryDirectory() as directory:
+        config_path = f"{directory}/config.json"
+        cached_config_path = f"{directory}/cached_config.json"
+        with open(config_path, "w") as file:
+            json.dump(config, file)
+        with open(cached_config_path, "w") as file:
+            json.dump({**config, "discovery_cache_dir": f"{directory}/cache"}, file)
+        # Warm the cache, and compile the tap's modules, before timing
+        time_command([*discover, "--config", cached_config_path], 1)
+        return {
+            "interpreter_seconds": round(time_command(["-c", "pass"], runs), 3),
+            "import_seconds": round(
+                time_command(["-c", "import tap_bamboohr.tap"], runs), 3
+            ),
+            "discover_seconds": round(
+                time_command([*discover, "--config", config_path], runs), 3
+            ),
+            "discover_cached_seconds": round(
+                time_command([*discover, "--config", cached_config_path], runs), 3
+            ),
+        }
+
+
+def main(argv: t.Optional[t.List[str]] = None) -> None:
+    """Benchmark full syncs and print their measurements as JSON lines."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--employees",
+        type=int,
+        nargs="+",
+        default=[100, 10_000],
+        help="Number of employees of each account to sync.",
+    )
+    parser.add_argument(
+        "--report-fields",
+        type=int,
+        default=200,
+        help="Number of fields of the custom report.",
+    )
+    parser.add_argument(
+        "--config",
+        type=argparse.FileType(),
+        help="JSON file of extra tap settings, e.g. `stream_responses`.",
+    )
+    parser.add_argument(
+        "--extractors",
+        action="store_true",
+        help="Benchmark JSONPath extraction on payloads of each size instead.",
+    )
+    parser.add_argument(
+        "--standardize",
+        action="store_true",
+        help="Benchmark standardizing the rows of custom reports instead.",
+    )
+    parser.add_argument(
+        "--schemas",
+        action="store_true",
+        help="Benchmark building and reading the schemas of custom reports instead.",
+    )
+    parser.add_argument(
+        "--startup",
+        action="store_true",
+        help="Benchmark starting the tap and running discovery instead.",
+    )
+    parser.add_argument(
+        "--runs",
+        type=int,
+        default=5,
+        help="Number of runs of each command timed with `--startup`.",
+    )
+    args = parser.parse_args(argv)
+    if args.extractors:
+        for employees in args.employees:
+            for result in benchmark_extractors(employees, args.report_fields):
+                print(json.dumps({"employees": employees, **result}), flush=True)
+        return
+    if args.standardize:
+        for employees in args.employees:
+            result = benchmark_standardize(employees, args.report_fields)
+            print(json.dumps({"employees": employees, **result}), flush=True)
+        return
+    if args.schemas:
+        print(json.dumps(benchmark_schemas(args.report_fields)), flush=True)
+        return
+    settings = json.load(args.config) if args.config else {}
+    if args.startup:
+        for employees in args.employees:
+            config = benchmark_config(employees, args.report_fields, settings)
+            result = benchmark_startup(config, args.runs)
+            print(json.dumps({"employees": employees, **result}), flush=True)
+        return
+    for employees in args.employees:
+        config = benchmark_config(employees, args.report_fields, settings)
+        print(json.dumps(run_isolated(config)), flush=True)
+
+
+if __name__ == "__main__":
+    main()
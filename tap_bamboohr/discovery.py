@@ -0,0 +1,93 @@
+"""On-disk cache of the account metadata requested during discovery."""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+import typing as t
+from importlib import metadata
+from pathlib import Path
+
+from tap_bamboohr.photocache import write_atomic
+
+#: Bumped when the layout of cached entries changes, invalidating older caches.
+CACHE_VERSION = 1
+
+
+def package_version() -> str:
+    """Return the installed version of the tap, if it is installed."""
+    try:
+        return metadata.version("tap-bamboohr")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+class DiscoveryCache:
+    """Metadata requested from an account during discovery, kept between runs.
+
+    Discovery runs on every invocation of the tap, including syncs given a
+    catalog, so responses such as the employee table metadata would otherwise be
+    requested on every run. Entries are stored in one JSON file per account,
+    named after a hash of `CACHE_VERSION`, the tap's version and `key`, and are
+    requested again once older than `max_age` seconds.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        key: t.Dict[str, t.Any],
+        max_age: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_age = max_age
+        digest = hashlib.sha256(
+            json.dumps(
+                {
+                    "cache_version": CACHE_VERSION,
+                    "package_version": package_version(),
+                    **key,
+                },
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+        self.path = self.directory / f"discovery-{digest[:16]}.json"
+        self.lock = threading.Lock()
+        self.entries = self.load()
+
+    def load(self) -> t.Dict[str, dict]:
+        """Read the cached entries, dropping the expired ones."""
+        try:
+            entries = json.loads(self.path.read_text())
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(entries, dict):
+            return {}
+        return {
+            key: entry
+            for key, entry in entries.items()
+            if isinstance(entry, dict) and not self.expired(entry)
+        }
+
+    def expired(self, entry: dict) -> bool:
+        if self.max_age is None:
+            return False
+        return time.time() - entry.get("fetched_at", 0) > self.max_age
+
+    def get(self, key: str, fetch: t.Callable[[], t.Any]) -> t.Any:
+        """Return the cached value of `key`, or fetch, cache and return it.
+
+        Values must be serializable to JSON.
+        """
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or self.expired(entry):
+                entry = {"fetched_at": time.time(), "value": fetch()}
+                self.entries[key] = entry
+                self.save()
+            return entry["value"]
+
+    def save(self) -> None:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        write_atomic(self.path, json.dumps(self.entries).encode())
@@ -0,0 +1,137 @@
+"""Streaming helpers for employee photo bytes."""
+from __future__ import annotations
+
+import base64
+import hashlib
+import os
+import tempfile
+import typing as t
+from pathlib import Path
+
+#: Size of the chunks photos are read and written in.
+CHUNK_SIZE = 64 * 1024
+#: Bytes at the start of a photo searched for its dimensions.
+HEADER_SIZE = 64 * 1024
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+GIF_SIGNATURES = (b"GIF87a", b"GIF89a")
+JPEG_SOF_MARKERS = set(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+
+class Base64Encoder:
+    """Incremental base64 encoder, so photos never sit in memory unencoded."""
+
+    def __init__(self) -> None:
+        self._pieces: t.List[str] = []
+        self._remainder = b""
+
+    def update(self, chunk: bytes) -> None:
+        data = self._remainder + chunk
+        cut = len(data) - len(data) % 3
+        self._pieces.append(base64.b64encode(data[:cut]).decode("ascii"))
+        self._remainder = data[cut:]
+
+    def finish(self) -> str:
+        self._pieces.append(base64.b64encode(self._remainder).decode("ascii"))
+        self._remainder = b""
+        return "".join(self._pieces)
+
+
+def image_dimensions(header: bytes) -> t.Optional[t.Tuple[int, int]]:
+    """Return the `(width, height)` of a JPEG, PNG or GIF from its first bytes."""
+    if header.startswith(PNG_SIGNATURE) and header[12:16] == b"IHDR":
+        return (
+            int.from_bytes(header[16:20], "big"),
+            int.from_bytes(header[20:24], "big"),
+        )
+    if header[:6] in GIF_SIGNATURES:
+        return (
+            int.from_bytes(header[6:8], "little"),
+            int.from_bytes(header[8:10], "little"),
+        )
+    if header[:2] == b"\xff\xd8":
+        index = 2
+        while index + 9 <= len(header):
+            if header[index] != 0xFF:
+                return None
+            marker = header[index + 1]
+            if marker == 0xFF:
+                # Fill byte
+                index += 1
+                continue
+            if marker == 0x01 or 0xD0 <= marker <= 0xD8:
+                # Markers without a length
+                index += 2
+                continue
+            if marker in JPEG_SOF_MARKERS:
+                return (
+                    int.from_bytes(header[index + 7 : index + 9], "big"),
+                    int.from_bytes(header[index + 5 : index + 7], "big"),
+                )
+            index += 2 + int.from_bytes(header[index + 2 : index + 4], "big")
+    return None
+
+
+def read_photo(
+    chunks: t.Iterable[bytes],
+    encode: bool = False,
+    directory: t.Optional[Path] = None,
+) -> t.Dict[str, t.Any]:
+    """Read the bytes of a photo once, without holding all of them in memory.
+
+    Args:
+        chunks: The photo's bytes, in chunks.
+        encode: Whether to base64 encode the photo.
+        directory: If set, the photo is written to this directory, named after its
+            SHA-256.
+
+    Returns:
+        The photo's `sha256`, `size` and `dimensions`, along with its `base64`
+        encoding and `path` when requested.
+    """
+    hasher = hashlib.sha256()
+    encoder = Base64Encoder() if encode else None
+    file = None
+    if directory:
+        file = tempfile.NamedTemporaryFile(dir=directory, delete=False)
+    header = b""
+    size = 0
+    try:
+        for chunk in chunks:
+            hasher.update(chunk)
+            size += len(chunk)
+            if len(header) < HEADER_SIZE:
+                header += chunk[: HEADER_SIZE - len(header)]
+            if encoder:
+                encoder.update(chunk)
+            if file:
+                file.write(chunk)
+    except BaseException:
+        if file:
+            file.close()
+            os.unlink(file.name)
+        raise
+
+    sha256 = hasher.hexdigest()
+    path = None
+    if file and directory:
+        file.close()
+        path = directory / sha256
+        os.replace(file.name, path)
+    return {
+        "sha256": sha256,
+        "size": size,
+        "dimensions": image_dimensions(header),
+        "base64": encoder.finish() if encoder else None,
+        "path": path,
+    }
+
+
+def iter_file(path: Path) -> t.Iterator[bytes]:
+    """Yield the bytes of a file in chunks."""
+    with open(path, "rb") as file:
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            yield chunk
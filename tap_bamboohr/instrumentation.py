@@ -0,0 +1,140 @@
+"""Timings of the phases of a sync, and optional profiling of each stream."""
+from __future__ import annotations
+
+import contextlib
+import enum
+import threading
+import typing as t
+from pathlib import Path
+
+import requests
+
+#: Phases of a sync timed for each stream:
+#: - wait: waiting for the rate limiter.
+#: - request: sending requests, until the response headers, or the whole body when
+#:   responses are not streamed.
+#: - parse: reading and decoding response bodies into records, including the time
+#:   spent in `standardize`.
+#: - standardize: standardizing temporal and boolean values.
+#: - write: validating, serializing and writing RECORD messages.
+PHASES = ("wait", "request", "parse", "standardize", "write")
+
+#: Phases timed for each record, only when the `record_timings` setting is enabled.
+RECORD_PHASES = ("standardize", "write")
+
+PROFILERS = ("cprofile", "pyinstrument")
+
+
+class Metric(str, enum.Enum):
+    """Metrics logged by the tap, in addition to the SDK's."""
+
+    HTTP_RESPONSE_PARSE_DURATION = "http_response_parse_duration"
+    SYNC_PHASE_DURATION = "sync_phase_duration"
+
+
+class StreamTimings:
+    """Thread-safe totals of the time a stream spent in each phase of its sync.
+
+    See `PHASES`, of which only the timed `phases` are kept. Also counts the
+    requests sent, and the records and bytes parsed from their responses.
+    """
+
+    def __init__(self, phases: t.Iterable[str] = PHASES) -> None:
+        """Start with no time spent in any of the timed `phases`."""
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.records = 0
+        self.bytes = 0
+        self.seconds = dict.fromkeys(phases, 0.0)
+
+    def add(self, phase: str, seconds: float) -> None:
+        """Add time spent in a phase."""
+        with self._lock:
+            self.seconds[phase] += seconds
+
+    def add_request(self, wait_seconds: float, request_seconds: float) -> None:
+        """Count a request, and the time spent waiting for and sending it."""
+        with self._lock:
+            self.requests += 1
+            self.seconds["wait"] += wait_seconds
+            self.seconds["request"] += request_seconds
+
+    def add_response(self, parse_seconds: float, records: int, size: int) -> None:
+        """Count the records and bytes of a response, and the time parsing it."""
+        with self._lock:
+            self.records += records
+            self.bytes += size
+            self.seconds["parse"] += parse_seconds
+
+    def to_dict(self) -> t.Dict[str, t.Any]:
+        """Return the counts and the seconds of each timed phase."""
+        return {
+            "requests": self.requests,
+            "records": self.records,
+            "bytes": self.bytes,
+            **{
+                f"{phase}_seconds": round(seconds, 3)
+                for phase, seconds in self.seconds.items()
+            },
+        }
+
+
+def response_size(response: requests.Response, streamed: bool) -> int:
+    """Return the number of body bytes received for a response.
+
+    Counts the bytes read so far for `streamed` responses, which may be compressed.
+    Other responses are sized by their Content-Length, or their body without one.
+    """
+    if streamed:
+        try:
+            return response.raw.tell()
+        except (AttributeError, OSError, ValueError):
+            return 0
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit():
+        return int(length)
+    return len(response.content or b"")
+
+
+@contextlib.contextmanager
+def profiled(profiler: t.Optional[str], path: Path) -> t.Iterator[None]:
+    """Profile the current thread while in the context, if `profiler` is set.
+
+    The profile is written to `path`, with a `.prof` suffix for cProfile, readable
+    with `pstats` or snakeviz, or an `.html` suffix for pyinstrument.
+    """
+    if not profiler:
+        yield
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(
+            f"Profiler `{profiler}` is not supported, use one of: "
+            f"{', '.join(PROFILERS)}."
+        )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if profiler == "cprofile":
+        import cProfile
+
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            profile.dump_stats(path.with_suffix(".prof"))
+        return
+
+    try:
+        from pyinstrument import Profiler
+    except ImportError:
+        raise ValueError(
+            "The `pyinstrument` profiler requires the pyinstrument package, "
+            "installed with `pip install tap-bamboohr[profile]`."
+        ) from None
+    sampler = Profiler()
+    sampler.start()
+    try:
+        yield
+    finally:
+        sampler.stop()
+        path.with_suffix(".html").write_text(sampler.output_html())
@@ -0,0 +1,113 @@
+"""Singer message output helpers for tap-bamboohr."""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import typing as t
+from decimal import Decimal
+
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.messages import format_message
+from singer_sdk.helpers._util import utc_now
+
+#: Number of characters `BatchedWriter` buffers before writing them through.
+BATCH_SIZE = 1024 * 1024
+
+
+class LockedWriter:
+    """Serializes writes to a text stream shared by several threads.
+
+    The SDK writes each Singer message with a single `write` call, so holding a
+    lock per call keeps messages from different streams from interleaving.
+    """
+
+    def __init__(self, stream: t.TextIO) -> None:
+        self.stream = stream
+        self.lock = threading.RLock()
+
+    def write(self, text: str) -> int:
+        with self.lock:
+            return self.stream.write(text)
+
+    def flush(self) -> None:
+        with self.lock:
+            self.stream.flush()
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self.stream, name)
+
+
+class BatchedWriter:
+    """Buffers writes to a text stream, writing them through in large batches.
+
+    The SDK flushes stdout after every message, which costs a system call per
+    record. Flushes are ignored here: messages are written through once
+    `batch_size` characters are buffered, and when `drain` is called. Not
+    thread-safe, wrap it in a `LockedWriter` to share it between threads.
+    """
+
+    def __init__(self, stream: t.TextIO, batch_size: int = BATCH_SIZE) -> None:
+        self.stream = stream
+        self.batch_size = batch_size
+        self.buffer: t.List[str] = []
+        self.buffered = 0
+
+    def write(self, text: str) -> int:
+        self.buffer.append(text)
+        self.buffered += len(text)
+        if self.buffered >= self.batch_size:
+            self.drain()
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> None:
+        """Write the buffered text through, and flush the stream."""
+        if self.buffer:
+            self.stream.write("".join(self.buffer))
+            self.buffer.clear()
+            self.buffered = 0
+        self.stream.flush()
+
+    def __getattr__(self, name: str) -> t.Any:
+        return getattr(self.stream, name)
+
+
+class DecimalValue(Exception):
+    """Raised by `RECORD_ENCODER` on Decimal values, which it cannot output."""
+
+
+def encode_default(value: t.Any) -> str:
+    if isinstance(value, Decimal):
+        raise DecimalValue
+    return str(value)
+
+
+#: Gives the same output as the SDK's `format_message`, which calls simplejson
+#: with `default=str`, for JSON values and values output with `str`, but is faster
+#: as it is built once and runs in C. Decimals are left to the SDK.
+RECORD_ENCODER = json.JSONEncoder(default=encode_default)
+
+
+def write_record_message(stream: str, record: dict) -> None:
+    """Write a RECORD message to stdout, like the SDK's `write_message` but faster.
+
+    The output is the same, but stdout is not flushed: see `BatchedWriter`.
+    """
+    time_extracted = utc_now()
+    try:
+        line = RECORD_ENCODER.encode(
+            {
+                "type": "RECORD",
+                "stream": stream,
+                "record": record,
+                "time_extracted": time_extracted,
+            }
+        )
+    except DecimalValue:
+        line = format_message(
+            RecordMessage(stream=stream, record=record, time_extracted=time_extracted)
+        )
+    sys.stdout.write(line + "\n")
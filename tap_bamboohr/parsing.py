@@ -0,0 +1,63 @@
+"""Incremental JSON parsing helpers for tap-bamboohr."""
+from __future__ import annotations
+
+import typing as t
+
+import ijson
+import requests
+
+
+def response_body(response: requests.Response) -> t.IO[bytes]:
+    """Return a file-like object reading the (decoded) body of a streamed response."""
+    response.raw.decode_content = True
+    return response.raw
+
+
+def iter_top_level_items(
+    response: requests.Response, prefixes: t.Collection[str]
+) -> t.Iterator[t.Tuple[str, t.Any]]:
+    """Yield `(prefix, item)` for each array item under the given top level keys.
+
+    `prefixes` are the top level keys holding arrays, e.g. `{"fields",
+    "employees"}`, of a response requested with `stream=True`. Items are built one
+    at a time from the parser's events, so only a single item is held in memory
+    regardless of the size of the response.
+    """
+    item_prefixes = {f"{prefix}.item": prefix for prefix in prefixes}
+    builder: ijson.ObjectBuilder | None = None
+    current = None
+    for prefix, event, value in ijson.parse(response_body(response), use_float=True):
+        if builder is None:
+            if prefix in item_prefixes and event in ("start_map", "start_array"):
+                builder = ijson.ObjectBuilder()
+                current = prefix
+            elif prefix in item_prefixes:
+                # Scalar array item
+                yield item_prefixes[prefix], value
+                continue
+            else:
+                continue
+        builder.event(event, value)
+        if prefix == current and event in ("end_map", "end_array"):
+            yield item_prefixes[current], builder.value
+            builder = None
+            current = None
+
+
+def iter_map_items(
+    response: requests.Response, prefix: str
+) -> t.Iterator[t.Tuple[str, t.Any]]:
+    """Yield `(key, value)` pairs of the object under `prefix`, one at a time.
+
+    `prefix` is the top level key holding an object, e.g. `"employees"`, of a
+    response requested with `stream=True`.
+    """
+    yield from ijson.kvitems(response_body(response), prefix, use_float=True)
+
+
+def iter_array_items(response: requests.Response) -> t.Iterator[t.Any]:
+    """Yield the items of the top level array of a response, one at a time.
+
+    The response must be requested with `stream=True`.
+    """
+    yield from ijson.items(response_body(response), "item", use_float=True)
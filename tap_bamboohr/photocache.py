@@ -0,0 +1,129 @@
+"""On-disk cache of employee photos for tap-bamboohr."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import time
+import typing as t
+from pathlib import Path
+from urllib.parse import quote
+
+
+def write_atomic(path: Path, content: bytes) -> None:
+    """Write a file so that concurrent readers never see a partial file."""
+    with tempfile.NamedTemporaryFile(dir=path.parent, delete=False) as file:
+        file.write(content)
+    os.replace(file.name, path)
+
+
+class PhotoCache:
+    """Content-addressed cache of employee photos.
+
+    Photo bytes are stored once per SHA-256 under `blobs/`, where they are written
+    directly by `images.read_photo`. Each employee and photo size has a small JSON
+    entry under `entries/` pointing at its blob, along with the ETag/Last-Modified
+    validators used for conditional requests.
+
+    Entries not revalidated within `max_age` seconds are dropped, and the least
+    recently used blobs are dropped once the blobs exceed `max_bytes`.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        max_bytes: int | None = None,
+        max_age: float | None = None,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.blobs_dir = self.directory / "blobs"
+        self.entries_dir = self.directory / "entries"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.entries_dir.mkdir(parents=True, exist_ok=True)
+
+    def _entry_path(self, employee_id: t.Any, size: str) -> Path:
+        return self.entries_dir / size / f"{quote(str(employee_id), safe='')}.json"
+
+    def _blob_path(self, sha256: str) -> Path:
+        return self.blobs_dir / sha256
+
+    def blob_path(self, entry: dict) -> Path:
+        """Return the path of the photo of a cache entry, marking it as used."""
+        path = self._blob_path(entry["sha256"])
+        os.utime(path)  # Mark as recently used for size based eviction
+        return path
+
+    def get(self, employee_id: t.Any, size: str) -> dict | None:
+        """Return the cache entry of an employee photo, or None on a miss."""
+        try:
+            entry = json.loads(self._entry_path(employee_id, size).read_bytes())
+        except (OSError, ValueError):
+            return None
+        if self._expired(entry) or not self._blob_path(entry["sha256"]).exists():
+            return None
+        return entry
+
+    def put(
+        self,
+        employee_id: t.Any,
+        size: str,
+        sha256: str,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> dict:
+        """Store the entry of a photo already written to the blobs, and return it."""
+        entry = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": sha256,
+            "validated_at": time.time(),
+        }
+        self._write_entry(employee_id, size, entry)
+        return entry
+
+    def revalidated(self, employee_id: t.Any, size: str, entry: dict) -> dict:
+        """Record that a cache entry was confirmed unchanged by the API."""
+        entry = dict(entry, validated_at=time.time())
+        self._write_entry(employee_id, size, entry)
+        return entry
+
+    def _write_entry(self, employee_id: t.Any, size: str, entry: dict) -> None:
+        path = self._entry_path(employee_id, size)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(path, json.dumps(entry).encode("utf-8"))
+
+    def _expired(self, entry: dict) -> bool:
+        return bool(self.max_age) and time.time() - entry["validated_at"] > self.max_age
+
+    def evict(self) -> None:
+        """Drop expired entries, unreferenced blobs and blobs over the size limit."""
+        referenced = set()
+        for path in self.entries_dir.glob("*/*.json"):
+            try:
+                entry = json.loads(path.read_bytes())
+            except (OSError, ValueError):
+                entry = None
+            if entry is None or self._expired(entry):
+                path.unlink(missing_ok=True)
+            else:
+                referenced.add(entry["sha256"])
+
+        blobs = []
+        for path in self.blobs_dir.iterdir():
+            if path.name not in referenced:
+                path.unlink(missing_ok=True)
+                continue
+            stat = path.stat()
+            blobs.append((stat.st_mtime, stat.st_size, path))
+
+        if self.max_bytes is None:
+            return
+        total = sum(size for _, size, _ in blobs)
+        for _, size, path in sorted(blobs):
+            if total <= self.max_bytes:
+                break
+            # Entries pointing at a dropped blob are treated as misses by get()
+            path.unlink(missing_ok=True)
+            total -= size
@@ -0,0 +1,118 @@
+"""Request rate limiting shared by all streams of a tap."""
+from __future__ import annotations
+
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+
+#: Rate, in requests per second, to fall back to when an unlimited tap is throttled.
+THROTTLED_RATE = 10.0
+#: Lowest rate the limiter slows down to.
+MIN_RATE = 0.1
+#: Number of requests in a row to go through before the rate is fully restored.
+RESTORE_AFTER_SUCCESSES = 100
+
+
+def retry_after_seconds(response: requests.Response | None) -> float | None:
+    """Return the number of seconds a response's Retry-After header asks to wait.
+
+    Supports both the delay-seconds and the HTTP-date forms of the header.
+    """
+    if response is None:
+        return None
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+class RateLimiter:
+    """Thread-safe token bucket that adapts to throttling by the API.
+
+    Requests are limited to `rate` per second, or unlimited if `rate` is None. When
+    the API throttles a request, the rate is halved and every request pauses until
+    the Retry-After delay has passed. Each successful request then raises the rate
+    by `recovery` requests per second, back up to `rate`, and once
+    `restore_after` requests in a row went through, `rate` is restored at once,
+    including an unlimited one.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        recovery: float = 0.1,
+        restore_after: int = RESTORE_AFTER_SUCCESSES,
+    ) -> None:
+        self.max_rate = rate
+        self.rate = rate
+        self.recovery = recovery
+        self.restore_after = restore_after
+        self._successes = 0
+        self._lock = threading.Lock()
+        self._tokens = 1.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def acquire(self) -> float:
+        """Block until a request may be sent.
+
+        Returns:
+            The number of seconds spent waiting.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if self._paused_until > now:
+                    wait = self._paused_until - now
+                elif self.rate is None:
+                    return waited
+                else:
+                    capacity = max(1.0, self.rate)
+                    elapsed = now - self._updated
+                    self._tokens = min(capacity, self._tokens + elapsed * self.rate)
+                    self._updated = now
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return waited
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def throttled(self, retry_after: float | None = None) -> None:
+        """Slow down after the API throttled a request."""
+        with self._lock:
+            self.rate = max(MIN_RATE, (self.rate or THROTTLED_RATE * 2) / 2)
+            self._successes = 0
+            self._tokens = 0.0
+            self._updated = time.monotonic()
+            if retry_after:
+                self._paused_until = max(
+                    self._paused_until, self._updated + retry_after
+                )
+
+    def succeeded(self) -> None:
+        """Speed back up after a request went through."""
+        with self._lock:
+            if self.rate is None or self.rate == self.max_rate:
+                return
+            self._successes += 1
+            if self._successes >= self.restore_after:
+                self.rate = self.max_rate
+                self._successes = 0
+                return
+            rate = self.rate + self.recovery
+            self.rate = min(rate, self.max_rate) if self.max_rate else rate
@@ -0,0 +1,268 @@
+"""Recording and replay of BambooHR API responses, for offline runs."""
+from __future__ import annotations
+
+import hashlib
+import hmac
+import io
+import json
+import math
+import re
+import secrets
+import typing as t
+from datetime import date, timedelta
+from pathlib import Path
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+from tap_bamboohr.images import HEADER_SIZE, PNG_SIGNATURE, image_dimensions
+from tap_bamboohr.photocache import write_atomic
+
+#: Response headers that are not recorded: credentials, and framing that no longer
+#: applies to the decoded body.
+SCRUBBED_HEADERS = {
+    "set-cookie",
+    "www-authenticate",
+    "content-encoding",
+    "content-length",
+    "transfer-encoding",
+}
+
+
+#: Keys of JSON response bodies whose values are recorded as they are when scrubbing
+#: them: ids and change times, and the descriptions of fields and time off types.
+KEPT_KEYS = frozenset(
+    {
+        "id",
+        "employeeId",
+        "fieldId",
+        "alias",
+        "type",
+        "fields",
+        "lastChanged",
+        "isPhotoUploaded",
+        "photoUploaded",
+        "canUploadPhoto",
+    }
+)
+#: Values left as they are when scrubbing, which BambooHR uses for booleans and
+#: empty dates.
+KEPT_VALUES = frozenset({"", "true", "false", "0000-00-00"})
+DATE_PATTERN = re.compile(r"\d{4}-\d{2}-\d{2}")
+
+
+class MissingRecordingError(Exception):
+    """Raised when a request has no recorded response to replay."""
+
+
+def request_target(request: requests.PreparedRequest, url_base: str) -> str:
+    """Return the URL of a request relative to the API, without the subdomain."""
+    url = request.url or ""
+    if url.startswith(url_base):
+        return url[len(url_base) :]
+    parts = urlsplit(url)
+    return f"{parts.path}?{parts.query}" if parts.query else parts.path
+
+
+def request_key(request: requests.PreparedRequest, url_base: str) -> str:
+    """Return a stable name for a request, ignoring the account and credentials."""
+    body = request.body or b""
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    digest = hashlib.sha256()
+    digest.update(f"{request.method} {request_target(request, url_base)}\n".encode())
+    digest.update(body)
+    return f"{(request.method or 'get').lower()}-{digest.hexdigest()[:24]}"
+
+
+def build_response(
+    request: requests.PreparedRequest,
+    status_code: int,
+    headers: t.Mapping[str, str],
+    body: bytes,
+) -> requests.Response:
+    """Build a response as returned by a transport adapter, readable as a stream."""
+    response = requests.Response()
+    response.status_code = status_code
+    response.headers = CaseInsensitiveDict(headers)
+    response.encoding = get_encoding_from_headers(response.headers)
+    response.raw = io.BytesIO(body)
+    response.url = request.url or ""
+    response.request = request
+    response.reason = ""
+    return response
+
+
+def scrub_string(value: str, key: bytes) -> str:
+    """Replace the letters and digits of a value, keeping its shape.
+
+    Values are replaced according to their HMAC with `key`, so the same value is
+    replaced the same way throughout a recording, and records still join on it,
+    but values cannot be guessed back without the key. Dates are replaced by
+    other valid dates, keeping the time of date-times.
+    """
+    if value in KEPT_VALUES:
+        return value
+    digest = hmac.new(key, value.encode("utf-8"), hashlib.sha256).digest()
+    if DATE_PATTERN.match(value):
+        days = int.from_bytes(digest[:4], "big") % 20000
+        return (date(1970, 1, 1) + timedelta(days=days)).isoformat() + value[10:]
+    characters = []
+    for index, character in enumerate(value):
+        byte = digest[index % len(digest)]
+        if character.isdigit():
+            characters.append(str(byte % 10))
+        elif character.isalpha():
+            letter = chr(ord("a") + byte % 26)
+            characters.append(letter.upper() if character.isupper() else letter)
+        else:
+            characters.append(character)
+    return "".join(characters)
+
+
+def scrub_json(value: t.Any, key: bytes) -> t.Any:
+    """Scrub the strings and numbers of a JSON document, see `scrub_string`.
+
+    Object keys, and the values of `KEPT_KEYS`, are kept as they are.
+    """
+    if isinstance(value, dict):
+        return {
+            name: item if name in KEPT_KEYS else scrub_json(item, key)
+            for name, item in value.items()
+        }
+    if isinstance(value, list):
+        return [scrub_json(item, key) for item in value]
+    if isinstance(value, str):
+        return scrub_string(value, key)
+    if isinstance(value, float) and math.isfinite(value):
+        return float(scrub_string(f"{value:f}", key))
+    if isinstance(value, int) and not isinstance(value, bool):
+        return int(scrub_string(str(value), key))
+    return value
+
+
+def scrub_body(headers: t.Dict[str, str], body: bytes, key: bytes) -> bytes:
+    """Return a response body without the personal data it holds.
+
+    JSON bodies are scrubbed with `scrub_json`, and photos are replaced by the
+    header of a PNG of the same dimensions. `headers` are updated to match.
+    """
+    content_type = next(
+        (value for name, value in headers.items() if name.lower() == "content-type"),
+        "",
+    )
+    if content_type.startswith("image/"):
+        width, height = image_dimensions(body[:HEADER_SIZE]) or (1, 1)
+        for name in [name for name in headers if name.lower() == "content-type"]:
+            headers[name] = "image/png"
+        return (
+            PNG_SIGNATURE
+            + (13).to_bytes(4, "big")
+            + b"IHDR"
+            + width.to_bytes(4, "big")
+            + height.to_bytes(4, "big")
+        )
+    if not body:
+        return body
+    try:
+        document = json.loads(body)
+    except ValueError:
+        return scrub_string(body.decode("utf-8", "replace"), key).encode("utf-8")
+    return json.dumps(scrub_json(document, key)).encode("utf-8")
+
+
+class RecordingAdapter(HTTPAdapter):
+    """Transport adapter saving each response it receives to a directory.
+
+    Each response is saved as `<key>.json`, holding the request, status and
+    headers, and `<key>.body` holding the decoded body, where `<key>` is given by
+    `request_key`. Credentials are never saved: they are only sent in request
+    headers, which are not recorded.
+
+    With `scrub`, the personal data of employees is removed from the bodies before
+    they are saved, see `scrub_body`, with a key drawn for each adapter and never
+    saved. Responses are returned to the tap scrubbed too, so that a recorded run
+    and its replay sync the same records.
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        url_base: str,
+        scrub: bool = True,
+        **kwargs: t.Any,
+    ) -> None:
+        super().__init__(**kwargs)
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.url_base = url_base
+        self.scrub_key = secrets.token_bytes(32) if scrub else None
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: t.Any
+    ) -> requests.Response:
+        response = super().send(request, **kwargs)
+        try:
+            body = response.raw.read(decode_content=True)
+        finally:
+            response.close()
+        headers = {
+            name: value
+            for name, value in response.headers.items()
+            if name.lower() not in SCRUBBED_HEADERS
+        }
+        if self.scrub_key is not None:
+            body = scrub_body(headers, body, self.scrub_key)
+        key = request_key(request, self.url_base)
+        request_body = request.body or b""
+        if isinstance(request_body, bytes):
+            request_body = request_body.decode("utf-8", "replace")
+        recording = {
+            "request": {
+                "method": request.method,
+                "url": request_target(request, self.url_base),
+                "body": request_body or None,
+            },
+            "status_code": response.status_code,
+            "headers": headers,
+        }
+        write_atomic(self.directory / f"{key}.body", body)
+        write_atomic(
+            self.directory / f"{key}.json", json.dumps(recording, indent=2).encode()
+        )
+        return build_response(request, response.status_code, headers, body)
+
+
+class ReplayAdapter(BaseAdapter):
+    """Transport adapter replaying the responses saved by a `RecordingAdapter`.
+
+    No request is sent over the network; requests without a recorded response fail
+    with `MissingRecordingError`.
+    """
+
+    def __init__(self, directory: str | Path, url_base: str) -> None:
+        super().__init__()
+        self.directory = Path(directory)
+        self.url_base = url_base
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: t.Any
+    ) -> requests.Response:
+        key = request_key(request, self.url_base)
+        try:
+            recording = json.loads((self.directory / f"{key}.json").read_bytes())
+            body = (self.directory / f"{key}.body").read_bytes()
+        except FileNotFoundError:
+            raise MissingRecordingError(
+                f"No recorded response for {request.method} "
+                f"{request_target(request, self.url_base)} in {self.directory}"
+            ) from None
+        return build_response(
+            request, recording["status_code"], recording["headers"], body
+        )
+
+    def close(self) -> None:
+        pass
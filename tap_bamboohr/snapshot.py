@@ -0,0 +1,77 @@
+"""On-disk index of the records emitted by full table streams, to diff snapshots."""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import typing as t
+from pathlib import Path
+
+
+class SnapshotIndex:
+    """Hashes of the records a stream last emitted, by primary key.
+
+    Kept in one SQLite database per stream, named after a hash of `key`, so lookups
+    go through the primary key index and memory use stays bounded however many
+    records the stream has. Each run completed with `commit` increments the index's
+    generation, stored as the database's `user_version`, and keys not seen by the
+    run are dropped. Nothing is kept from a run that is not committed.
+    """
+
+    def __init__(self, directory: str | Path, key: t.Dict[str, t.Any]) -> None:
+        """Open the index of `key` in `directory`, creating it if needed."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256(
+            json.dumps(key, sort_keys=True, default=str).encode()
+        ).hexdigest()
+        self.path = directory / f"snapshot-{digest[:16]}.sqlite3"
+        self.connection = sqlite3.connect(self.path)
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS records ("
+            "key TEXT PRIMARY KEY, hash BLOB NOT NULL, generation INTEGER NOT NULL"
+            ") WITHOUT ROWID"
+        )
+        self.connection.commit()
+        (self.generation,) = self.connection.execute("PRAGMA user_version").fetchone()
+
+    def update(self, key: str, digest: bytes) -> bool:
+        """Record the hash of a key seen by this run, returning whether it changed.
+
+        Keys new to the index count as changed.
+        """
+        generation = self.generation + 1
+        cursor = self.connection.execute(
+            "UPDATE records SET generation = ? WHERE key = ? AND hash = ?",
+            (generation, key, digest),
+        )
+        if cursor.rowcount:
+            return False
+        self.connection.execute(
+            "INSERT INTO records VALUES (?, ?, ?) ON CONFLICT (key) DO UPDATE "
+            "SET hash = excluded.hash, generation = excluded.generation",
+            (key, digest, generation),
+        )
+        return True
+
+    def stale_keys(self) -> t.Iterator[str]:
+        """Yield the keys of the last run which this run has not seen."""
+        cursor = self.connection.execute(
+            "SELECT key FROM records WHERE generation <= ?", (self.generation,)
+        )
+        for (key,) in cursor:
+            yield key
+
+    def commit(self) -> None:
+        """Drop the keys this run has not seen, and start a new generation."""
+        self.connection.execute(
+            "DELETE FROM records WHERE generation <= ?", (self.generation,)
+        )
+        self.connection.execute(f"PRAGMA user_version = {self.generation + 1}")
+        self.connection.commit()
+        self.generation += 1
+
+    def close(self) -> None:
+        """Close the index, rolling back a run that was not committed."""
+        self.connection.close()
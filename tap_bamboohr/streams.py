@@ -1,25 +1,133 @@
 """Stream class for tap-bamboohr."""
 from __future__ import annotations
 
-import base64
-import copy
+import calendar
+import difflib
+import hashlib
 import json
+import re
+import sys
+import time
 import typing as t
-from functools import cached_property
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from functools import cached_property, lru_cache
 from http import HTTPStatus
 from pathlib import Path
 from typing import Any, Dict, Iterable, Optional
 
+import backoff
 import requests
-from singer_sdk import typing
-from singer_sdk._singerlib import Schema
+from singer_sdk import metrics, typing
+from singer_sdk._singerlib import Catalog, Schema
 from singer_sdk.authenticators import BasicAuthenticator
-from singer_sdk.helpers.jsonpath import extract_jsonpath
+from singer_sdk.helpers._batch import BaseBatchFileEncoding, BatchConfig
+from singer_sdk.helpers._catalog import pop_deselected_record_properties
+from singer_sdk.helpers._typing import (
+    TypeConformanceLevel,
+    conform_record_data_types,
+    is_boolean_type,
+)
+from singer_sdk.mapper import SameRecordTransform
 from singer_sdk.pagination import SinglePagePaginator
+from singer_sdk.streams.core import REPLICATION_INCREMENTAL
 from singer_sdk.streams.rest import RESTStream
 from singer_sdk.tap_base import Tap
 
+from tap_bamboohr.batch import ParquetBatcher, ParquetEncoding
+from tap_bamboohr.images import CHUNK_SIZE, iter_file, read_photo
+from tap_bamboohr.instrumentation import (
+    PHASES,
+    RECORD_PHASES,
+    Metric,
+    StreamTimings,
+    response_size,
+)
+from tap_bamboohr.jsonpath import compile_jsonpath
+from tap_bamboohr.output import write_record_message
+from tap_bamboohr.parsing import (
+    iter_array_items,
+    iter_map_items,
+    iter_top_level_items,
+)
+from tap_bamboohr.photocache import PhotoCache
+from tap_bamboohr.ratelimit import retry_after_seconds
+from tap_bamboohr.snapshot import SnapshotIndex
+
+if t.TYPE_CHECKING:
+    from tap_bamboohr.tap import TapBambooHR
+
+API_URL_BASE = "https://api.bamboohr.com/api/gateway.php/{subdomain}/v1"
 SCHEMAS_DIR = Path(__file__).parent / Path("./schemas")
+FIELD_TYPES_FILEPATH = Path(__file__).parent / Path("./field_types.json")
+THROTTLING_STATUSES = {HTTPStatus.TOO_MANY_REQUESTS, HTTPStatus.SERVICE_UNAVAILABLE}
+# Changes are requested from a little before a stream's last sync, in case the
+# clocks of the tap and BambooHR disagree
+CHANGE_FEED_OVERLAP = timedelta(minutes=5)
+# Fields of PhotosUsers records that change along with an employee's photo
+PHOTO_FINGERPRINT_FIELDS = ("isPhotoUploaded", "lastChanged")
+# We want all of the time off; these should be far enough in the past/future
+TIME_OFF_START = date(1900, 1, 1)
+TIME_OFF_END = date(2100, 12, 12)
+# Time off is only split into windows from 2012 until a year from now
+TIME_OFF_WINDOWS_START = date(2012, 1, 1)
+TIME_OFF_HORIZON_DAYS = 366
+# Types of /meta/fields output as numbers when `report_field_metadata` is set
+INTEGER_FIELD_TYPES = {"int", "integer"}
+NUMBER_FIELD_TYPES = {"decimal", "number"}
+# Currency values of reports, e.g. "65000.00 USD"
+CURRENCY_PATTERN = re.compile(r"(?P<value>-?[\d,]*\.?\d+)\s*(?P<currency>[A-Za-z]{3})?")
+# Property of the records marking employees no longer returned by the API
+DELETED_AT_PROPERTY = "_sdc_deleted_at"
+
+
+def canonical_field_name(field_name: int | str) -> str:
+    """Converts an ambiguous field name into a single unambiguous name.
+
+    Args:
+        field_name: The field name to convert. Can be in any of the following
+        formats: "name", "123", "123.0", or 123
+
+    Returns:
+        An unambiguous name in the format: "name" or "123.0".
+    """
+    if not isinstance(field_name, (int, str)):
+        msg = "Field name cannot be canonicalized because it is not int or str."
+        raise TypeError(msg)
+    if isinstance(field_name, str):
+        try:
+            field_name = int(field_name)
+        except ValueError:
+            return field_name
+    return format(field_name, ".1f")
+
+
+def index_field_metadata(fields: Iterable[dict]) -> Dict[str, dict]:
+    """Index the fields listed by /meta/fields by canonical id and by alias."""
+    index = {}
+    for field in fields:
+        field_id = field.get("id")
+        if isinstance(field_id, float) and field_id.is_integer():
+            field_id = int(field_id)
+        if isinstance(field_id, (int, str)):
+            index[canonical_field_name(field_id)] = field
+        if field.get("alias"):
+            index[canonical_field_name(field["alias"])] = field
+    return index
+
+
+@lru_cache(maxsize=None)
+def get_field_types() -> Dict[str, str]:
+    """Return the BambooHR types of known fields, keyed by canonical field name.
+
+    field_types.json is only read the first time this is called.
+    """
+    with open(FIELD_TYPES_FILEPATH) as file:
+        return {
+            canonical_field_name(field_name): field_type
+            for field_name, field_type in json.load(file).items()
+        }
 
 
 class TapBambooHRStream(RESTStream):
@@ -27,12 +135,63 @@ class TapBambooHRStream(RESTStream):
 
     _LOG_REQUEST_METRIC_URLS: bool = True
 
+    #: Whether the stream can parse its responses incrementally. Only used when the
+    #: `stream_responses` setting is enabled.
+    supports_streaming: bool = False
+
+    #: Whether the stream is replicated on the employees' `lastChanged`, so it has
+    #: nothing to sync when the change feed shows no employee changed since its
+    #: bookmark. Only used when the `employee_change_feed` setting is enabled.
+    uses_change_feed: bool = False
+
+    #: Records whose children were skipped as synced by an interrupted run, and
+    #: whose children were synced since the last checkpoint.
+    _resumed_children: int = 0
+    _unsaved_children: int = 0
+
+    #: Whether the stream syncs all of its records on every run, so that those
+    #: unchanged since the last run can be left out. Only used when the
+    #: `snapshot_diff_dir` setting is set.
+    supports_snapshot_diff: bool = False
+
+    #: Index of the records emitted by the last run while records are diffed against
+    #: it, whether the state confirms the target received that run, and the number
+    #: of unchanged records left out.
+    _snapshot_index: Optional[SnapshotIndex] = None
+    _snapshot_confirmed: bool = False
+    _unchanged_records: int = 0
+
+    #: Setting with the number of threads in the stream's `executor`.
+    concurrency_setting: Optional[str] = None
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.update_deleted_at_property()
+
+    def apply_catalog(self, catalog: Catalog) -> None:
+        """Apply the catalog, whose keys may change whether records are diffed."""
+        super().apply_catalog(catalog)
+        self.update_deleted_at_property()
+
+    def update_deleted_at_property(self) -> None:
+        """Add `_sdc_deleted_at` to the schema if deleted records are marked."""
+        if self.snapshot_deletes:
+            self.schema["properties"].setdefault(
+                DELETED_AT_PROPERTY, {"type": ["string", "null"], "format": "date-time"}
+            )
+        else:
+            self.schema["properties"].pop(DELETED_AT_PROPERTY, None)
+
     @property
-    def url_base(self) -> str:
-        subdomain = self.config.get("subdomain")
-        return f"https://api.bamboohr.com/api/gateway.php/{subdomain}/v1"
+    def tap(self) -> TapBambooHR:
+        """Return the tap syncing the stream."""
+        return t.cast("TapBambooHR", self._tap)
 
     @property
+    def url_base(self) -> str:
+        return API_URL_BASE.format(subdomain=self.config.get("subdomain"))
+
+    @cached_property
     def http_headers(self) -> dict:
         """Return the http headers needed."""
         headers = {}
@@ -42,13 +201,535 @@ class TapBambooHRStream(RESTStream):
         headers["Accept"] = "application/json"
         return headers
 
-    @property
+    @cached_property
     def authenticator(self):
         auth_token = self.config.get("auth_token")
         # Password can be any string; it doesn't matter.
         return BasicAuthenticator(stream=self, username=auth_token, password="foobar")
 
     @property
+    def stream_response(self) -> bool:
+        """Whether responses are requested as streams and parsed incrementally."""
+        return self.supports_streaming and self.config.get("stream_responses", False)
+
+    @property
+    def requests_session(self) -> requests.Session:
+        """Return the keep-alive session shared by all streams of the tap."""
+        return self.tap.requests_session
+
+    @cached_property
+    def record_timings(self) -> bool:
+        """Whether the `RECORD_PHASES` are timed, for each record."""
+        return self.config.get("record_timings", False)
+
+    @cached_property
+    def timings(self) -> StreamTimings:
+        if self.record_timings:
+            return StreamTimings()
+        return StreamTimings(phase for phase in PHASES if phase not in RECORD_PHASES)
+
+    @cached_property
+    def executor(self) -> ThreadPoolExecutor:
+        """Return the threads the stream sends requests from in the background.
+
+        Sized by the stream's `concurrency_setting`, and shut down with
+        `shutdown_executor` once the stream has synced.
+        """
+        max_workers = 1
+        if self.concurrency_setting:
+            max_workers = self.config.get(self.concurrency_setting) or 1
+        return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=self.name)
+
+    def shutdown_executor(self) -> None:
+        """Shut down the stream's `executor`, if it was started.
+
+        Requests not started yet are cancelled, and the executor is started anew if
+        the stream syncs again.
+        """
+        executor = self.__dict__.pop("executor", None)
+        if executor is None:
+            return
+        if sys.version_info >= (3, 9):
+            executor.shutdown(cancel_futures=True)
+        else:
+            executor.shutdown()
+
+    def _write_state_message(self) -> None:
+        """Write out a STATE message with the latest state.
+
+        Skipped while streams are synced in parallel, where the tap writes the state
+        as each stream finishes instead, and for child streams whose parent
+        checkpoints their progress, which writes the state at each checkpoint.
+        """
+        if self.tap.syncing_in_parallel:
+            return
+        parent = self.parent_stream
+        if parent is not None and parent.child_checkpoint_interval:
+            return
+        super()._write_state_message()
+
+    @cached_property
+    def parent_stream(self) -> Optional[TapBambooHRStream]:
+        return next(
+            (
+                t.cast(TapBambooHRStream, stream)
+                for stream in self.tap.streams.values()
+                if self in stream.child_streams
+            ),
+            None,
+        )
+
+    @property
+    def child_checkpoint_interval(self) -> Optional[int]:
+        """Number of records whose children are synced between checkpoints.
+
+        None when the stream has no children or `child_checkpoint_interval` is not
+        set.
+        """
+        if not self.child_streams:
+            return None
+        return self.config.get("child_checkpoint_interval")
+
+    @cached_property
+    def completed_children(self) -> t.Set[str]:
+        """Keys of the child contexts synced since the stream last finished.
+
+        Includes those checkpointed by an interrupted run, see `_sync_children`.
+        """
+        return set(self.stream_state.get("completed_children", []))
+
+    @staticmethod
+    def child_checkpoint_key(child_context: dict) -> str:
+        """Return the key of a child context in checkpoints: its `_sdc_id`."""
+        if "_sdc_id" in child_context:
+            return str(child_context["_sdc_id"])
+        return json.dumps(child_context, sort_keys=True, default=str)
+
+    def children_completed(self, child_context: Optional[dict]) -> bool:
+        """Whether the children of a context were synced by an interrupted run."""
+        return (
+            bool(self.child_checkpoint_interval)
+            and child_context is not None
+            and self.child_checkpoint_key(child_context) in self.completed_children
+        )
+
+    def _sync_children(self, child_context: dict | None) -> None:
+        """Sync the children of a record, checkpointing progress if configured.
+
+        With `child_checkpoint_interval`, the contexts whose children were synced
+        are saved to the state every so many contexts, and skipped by the next run
+        if this one is interrupted. The checkpoints are forgotten by
+        `finish_child_checkpoints` once all records of the parent were synced.
+        """
+        interval = self.child_checkpoint_interval
+        if not interval or child_context is None:
+            super()._sync_children(child_context)
+            return
+        if self.children_completed(child_context):
+            self._resumed_children += 1
+            return
+        super()._sync_children(child_context)
+        self.completed_children.add(self.child_checkpoint_key(child_context))
+        self._unsaved_children += 1
+        if self._unsaved_children >= interval:
+            self.checkpoint_children()
+
+    def checkpoint_children(self) -> None:
+        """Save the contexts whose children were synced, and write the state."""
+        self.stream_state["completed_children"] = sorted(self.completed_children)
+        self._unsaved_children = 0
+        self.write_progress()
+
+    def write_progress(self) -> None:
+        """Write the state with the progress of the stream so far.
+
+        Unlike `_write_state_message`, also written while streams are synced in
+        parallel, through the tap.
+        """
+        self._is_state_flushed = False
+        if self.tap.syncing_in_parallel:
+            self.tap.write_stream_state(self)
+        else:
+            super()._write_state_message()
+
+    def finish_child_checkpoints(self) -> None:
+        """Forget the checkpointed contexts, once the children of all were synced."""
+        if not self.child_checkpoint_interval:
+            return
+        if self._resumed_children:
+            self.logger.info(
+                f"Resumed {self.name} after {self._resumed_children} records whose "
+                "children were synced by an interrupted run"
+            )
+        self.stream_state.pop("completed_children", None)
+        self.completed_children.clear()
+        self._resumed_children = 0
+        self._unsaved_children = 0
+        self._is_state_flushed = False
+
+    def _request(
+        self, prepared_request: requests.PreparedRequest, context: Optional[dict]
+    ) -> requests.Response:
+        """Send a request once the tap's rate limiter allows it.
+
+        Throttling responses slow the rate limiter down for all streams, and the time
+        spent waiting for the rate limiter and on the request is recorded.
+        """
+        rate_limiter = self.tap.rate_limiter
+        wait_seconds = rate_limiter.acquire()
+        start = time.perf_counter()
+        response = self.requests_session.send(
+            prepared_request, timeout=self.timeout, stream=self.stream_response
+        )
+        self.timings.add_request(wait_seconds, time.perf_counter() - start)
+        if response.status_code in THROTTLING_STATUSES:
+            rate_limiter.throttled(retry_after_seconds(response))
+        else:
+            rate_limiter.succeeded()
+        self._write_request_duration_log(
+            endpoint=self.path,
+            response=response,
+            context=context,
+            extra_tags={"url": prepared_request.path_url}
+            if self._LOG_REQUEST_METRIC_URLS
+            else None,
+        )
+        self.validate_response(response)
+        return response
+
+    def backoff_wait_generator(self) -> t.Generator[float, None, None]:
+        """Wait as long as Retry-After asks, or exponentially longer if it's missing."""
+
+        def wait_generator() -> t.Generator[float, None, None]:
+            exponential = backoff.expo(factor=2)
+            exponential.send(None)
+            exception = yield  # type: ignore[misc]
+            while True:
+                retry_after = retry_after_seconds(getattr(exception, "response", None))
+                if retry_after is None:
+                    retry_after = next(exponential)
+                exception = yield retry_after
+
+        return wait_generator()
+
+    def request_records(self, context: dict | None) -> t.Iterable[dict]:
+        """Request records from the API, timing how long each response takes to parse.
+
+        Same as the SDK's, except for the timing.
+        """
+        paginator = self.get_new_paginator()
+        decorated_request = self.request_decorator(self._request)
+
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+
+            while not paginator.finished:
+                prepared_request = self.prepare_request(
+                    context,
+                    next_page_token=paginator.current_value,
+                )
+                resp = decorated_request(prepared_request, context)
+                request_counter.increment()
+                self.update_sync_costs(prepared_request, resp, context)
+                yield from self.parse_timed(resp, context)
+
+                paginator.advance(resp)
+
+    def parse_timed(
+        self, response: requests.Response, context: Optional[dict]
+    ) -> Iterable[dict]:
+        """Parse a response with `parse_response`, timing it.
+
+        The time spent parsing, the records and the bytes read are added to the
+        stream's timings and logged as a metric once the response is parsed. Time
+        spent by the consumer of the records is not included.
+        """
+        records = 0
+        seconds = 0.0
+        rows = iter(self.parse_response(response))
+        while True:
+            start = time.perf_counter()
+            try:
+                row = next(rows)
+            except StopIteration:
+                seconds += time.perf_counter() - start
+                break
+            seconds += time.perf_counter() - start
+            records += 1
+            yield row
+        size = response_size(response, self.stream_response)
+        self.timings.add_response(seconds, records, size)
+        tags = {
+            metrics.Tag.STREAM: self.name,
+            metrics.Tag.ENDPOINT: self.path,
+            "records": records,
+            "bytes": size,
+        }
+        if context:
+            tags[metrics.Tag.CONTEXT] = context
+        self._log_metric(
+            metrics.Point(
+                "timer",
+                metric=Metric.HTTP_RESPONSE_PARSE_DURATION,  # type: ignore[arg-type]
+                value=seconds,
+                tags=tags,
+            )
+        )
+
+    def _write_record_message(self, record: dict) -> None:
+        start = time.perf_counter() if self.record_timings else None
+        if self._snapshot_index is None or self.snapshot_changed(record):
+            if self.fast_output:
+                self.write_record_fast(record)
+            else:
+                super()._write_record_message(record)
+        if start is not None:
+            self.timings.add("write", time.perf_counter() - start)
+
+    @cached_property
+    def fast_output(self) -> bool:
+        """Whether records are written with `write_record_fast`.
+
+        Only when `fast_output` is set, and records are output as they are: stream
+        maps and flattening are left to the SDK.
+        """
+        if not self.config.get("fast_output"):
+            return False
+        stream_maps = self.stream_maps
+        return (
+            len(stream_maps) == 1
+            and type(stream_maps[0]) is SameRecordTransform
+            and stream_maps[0].stream_alias == self.name
+            and not stream_maps[0].flattening_enabled
+        )
+
+    @cached_property
+    def has_deselected_properties(self) -> bool:
+        return not all(self.mask.values())
+
+    @cached_property
+    def unconformed_types(self) -> Dict[str, t.Tuple[type, ...]]:
+        """Types of the values of each property which the SDK's conformance keeps.
+
+        Strings, numbers, booleans and nulls, as output by `standardize_data`, are
+        kept as they are, except in boolean properties which only keep booleans
+        and nulls.
+        """
+        return {
+            name: (bool, type(None))
+            if is_boolean_type(schema)
+            else (str, int, float, bool, type(None))
+            for name, schema in self.schema.get("properties", {}).items()
+        }
+
+    def conform_record(self, record: dict) -> dict:
+        """Conform a record to the schema, like the SDK's `conform_record_data_types`.
+
+        Only the values of other types than `unconformed_types` are conformed by
+        the SDK, which would leave the rest unchanged anyway.
+        """
+        unconformed_types = self.unconformed_types
+        others = {
+            name: value
+            for name, value in record.items()
+            if type(value) not in unconformed_types.get(name, ())
+        }
+        if not others:
+            return record
+        conformed = conform_record_data_types(
+            stream_name=self.name,
+            record=others,
+            schema=self.schema,
+            level=self.TYPE_CONFORMANCE_LEVEL,
+            logger=self.logger,
+        )
+        # Properties missing from the schema are left out, as by the SDK
+        return {
+            name: conformed[name] if name in others else value
+            for name, value in record.items()
+            if name not in others or name in conformed
+        }
+
+    def write_record_fast(self, record: dict) -> None:
+        """Write a RECORD message, like the SDK's `_write_record_message` but faster.
+
+        Deselected properties are only looked for when there are any, only values
+        which need it are conformed, and the message is serialized with
+        `write_record_message`. The output is the same.
+        """
+        if self.has_deselected_properties:
+            pop_deselected_record_properties(
+                record, self.schema, self.mask, self.logger
+            )
+        if self.TYPE_CONFORMANCE_LEVEL != TypeConformanceLevel.NONE:
+            record = self.conform_record(record)
+        write_record_message(self.name, record)
+        self._is_state_flushed = False
+
+    @property
+    def snapshot_diff(self) -> bool:
+        """Whether records unchanged since the last run are left out.
+
+        Only when `snapshot_diff_dir` is set, for streams syncing all of their
+        records on every run.
+        """
+        return (
+            self.supports_snapshot_diff
+            and not self.replication_key
+            and bool(self.primary_keys)
+            and bool(self.config.get("snapshot_diff_dir"))
+        )
+
+    @property
+    def snapshot_deletes(self) -> bool:
+        """Whether records no longer returned by the API are marked deleted."""
+        return self.snapshot_diff and self.config.get("snapshot_diff_deletes", False)
+
+    @cached_property
+    def deselected_properties(self) -> t.Set[str]:
+        return {
+            name
+            for name in self.schema["properties"]
+            if not self.mask.get(("properties", name), True)
+        }
+
+    def snapshot_changed(self, record: dict) -> bool:
+        """Hash a record into the snapshot index, and return whether to emit it.
+
+        Records are emitted when they are new or changed since the last run, or when
+        the state does not confirm the target received the last run. Only selected
+        properties are hashed.
+        """
+        primary_keys = self.primary_keys or []
+        key = json.dumps([record.get(name) for name in primary_keys], default=str)
+        deselected = self.deselected_properties
+        values = {
+            name: value for name, value in record.items() if name not in deselected
+        }
+        digest = hashlib.blake2b(
+            json.dumps(values, sort_keys=True, default=str).encode("utf-8"),
+            digest_size=16,
+        ).digest()
+        changed = self._snapshot_index.update(key, digest)  # type: ignore[union-attr]
+        if changed or not self._snapshot_confirmed:
+            return True
+        self._unchanged_records += 1
+        return False
+
+    def _sync_records(
+        self, context: dict | None = None, *, write_messages: bool = True
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        """Sync records, and forget the child checkpoints once all were synced."""
+        if self.snapshot_diff:
+            records = self._sync_diffed_records(context, write_messages=write_messages)
+        else:
+            records = super()._sync_records(context, write_messages=write_messages)
+        yield from records
+        if self.child_checkpoint_interval:
+            self.finish_child_checkpoints()
+            if write_messages:
+                self._write_state_message()
+
+    def _sync_diffed_records(
+        self, context: dict | None = None, *, write_messages: bool = True
+    ) -> t.Generator[dict, t.Any, t.Any]:
+        """Sync records, leaving out those unchanged since the last run.
+
+        With `snapshot_diff_dir`, records are diffed against the stream's snapshot
+        index, see `snapshot_changed`: unchanged records are not written, or not
+        yielded to the batcher when batching, and with `snapshot_diff_deletes`,
+        records no longer returned are marked deleted. The index is only committed
+        once all records were synced, and its generation is saved to the state, so
+        that the next run can tell whether the target received this one.
+        """
+        index = self.tap.snapshot_index(self.name)
+        self._snapshot_confirmed = (
+            self.stream_state.get("snapshot_generation") == index.generation
+        )
+        if index.generation and not self._snapshot_confirmed:
+            self.logger.info(
+                f"The state does not confirm the last run of stream {self.name} was "
+                "received, emitting all of its records"
+            )
+        self._snapshot_index = index
+        self._unchanged_records = 0
+        try:
+            for record in super()._sync_records(context, write_messages=write_messages):
+                if write_messages or self.snapshot_changed(record):
+                    yield record
+            # Deleted records are written as they are
+            self._snapshot_index = None
+            deleted = 0
+            if self.snapshot_deletes:
+                deleted_at = datetime.now(timezone.utc).isoformat()
+                for key in index.stale_keys():
+                    record = dict(zip(self.primary_keys or [], json.loads(key)))
+                    record[DELETED_AT_PROPERTY] = deleted_at
+                    deleted += 1
+                    if write_messages:
+                        self._write_record_message(record)
+                    else:
+                        yield record
+            index.commit()
+            self.stream_state["snapshot_generation"] = index.generation
+            self._is_state_flushed = False
+            self.logger.info(
+                f"Left out {self._unchanged_records} records of stream {self.name} "
+                f"unchanged since the last run, and marked {deleted} deleted"
+            )
+            if write_messages:
+                self._write_state_message()
+        finally:
+            self._snapshot_index = None
+            index.close()
+
+    def get_batches(
+        self, batch_config: BatchConfig, context: dict | None = None
+    ) -> t.Iterable[t.Tuple[BaseBatchFileEncoding, t.List[str]]]:
+        """Write the records to batch files, yielding their encoding and manifest.
+
+        With the `parquet` encoding, records are written to Parquet files with typed
+        columns, see `ParquetBatcher`. Otherwise the SDK writes JSON lines files.
+        """
+        if batch_config.encoding.format != ParquetEncoding.__encoding_format__:
+            yield from super().get_batches(batch_config, context)
+            return
+        batcher = ParquetBatcher(
+            tap_name=self.tap_name,
+            stream_name=self.name,
+            batch_config=batch_config,
+            schema=self.schema,
+            properties=[
+                name
+                for name in self.schema["properties"]
+                if self.mask.get(("properties", name), True)
+            ],
+        )
+        records = self._sync_records(context, write_messages=False)
+        for manifest in batcher.get_batches(records):
+            yield batch_config.encoding, manifest
+
+    def log_sync_costs(self) -> None:
+        """Log the sync costs, and the time spent in each phase of the sync.
+
+        The phase timings are logged as metrics and as a summary.
+        """
+        super().log_sync_costs()
+        timings = self.timings
+        if not timings.requests and not timings.seconds.get("write"):
+            return
+        for phase, seconds in timings.seconds.items():
+            self._log_metric(
+                metrics.Point(
+                    "timer",
+                    metric=Metric.SYNC_PHASE_DURATION,  # type: ignore[arg-type]
+                    value=seconds,
+                    tags={metrics.Tag.STREAM: self.name, "phase": phase},
+                )
+            )
+        self.logger.info(f"Timings for stream {self.name}: {timings.to_dict()}")
+
+    @cached_property
     def temporal_fields(self) -> set:
         fields = set()
         for field, properties in self.schema["properties"].items():
@@ -60,7 +741,7 @@ class TapBambooHRStream(RESTStream):
                 fields.add(field)
         return fields
 
-    @property
+    @cached_property
     def boolean_fields(self) -> set:
         fields = set()
         for field, properties in self.schema["properties"].items():
@@ -68,68 +749,226 @@ class TapBambooHRStream(RESTStream):
                 fields.add(field)
         return fields
 
+    @cached_property
+    def field_converters(self) -> Dict[str, t.Callable[[Any], Any]]:
+        """Map each field needing standardization to its converter.
+
+        Built once per stream from the schema so that standardizing a row only costs
+        a single dictionary lookup per field.
+        """
+        converters: Dict[str, t.Callable[[Any], Any]] = {}
+        for field in self.temporal_fields:
+            converters[field] = nullify_temporal_value
+        for field in self.boolean_fields:
+            if field in converters:
+                converters[field] = lambda value: standardize_boolean_value(
+                    nullify_temporal_value(value)
+                )
+            else:
+                converters[field] = standardize_boolean_value
+        return converters
+
+    @property
+    def change_feed_since(self) -> Optional[datetime]:
+        """Return the time since which the stream needs to know of employee changes.
+
+        None if the stream does not use the change feed, or syncs all employees.
+        """
+        if (
+            not self.uses_change_feed
+            or self.replication_method != REPLICATION_INCREMENTAL
+        ):
+            return None
+        start = self.get_starting_timestamp(None)
+        if start is None and self.stream_state.get("replication_key") == (
+            self.replication_key
+        ):
+            # The starting timestamp is only set once the stream starts syncing
+            bookmark = self.stream_state.get("replication_key_value")
+            if bookmark:
+                start = datetime.fromisoformat(bookmark.replace("Z", "+00:00"))
+        return start
+
+    def changed_employees(self) -> Optional[Dict[str, datetime]]:
+        """Return when employees changed since `change_feed_since`, by id.
+
+        Returns None, meaning any employee may have changed, unless the
+        `employee_change_feed` setting is enabled.
+        """
+        since = self.change_feed_since
+        if not self.config.get("employee_change_feed", False) or since is None:
+            return None
+        return self.tap.employee_changes(since)
+
+    def nothing_changed(self) -> bool:
+        """Return whether the change feed shows no employee changed since the bookmark.
+
+        The stream then has nothing to sync, and skips its requests.
+        """
+        changes = self.changed_employees()
+        if changes is None or changes:
+            return False
+        self.logger.info(
+            f"No employee changed since {self.change_feed_since}, skipping the "
+            f"requests of stream {self.name}"
+        )
+        return True
+
+    @cached_property
+    def records_extractor(self) -> t.Callable[[Any], t.Iterator[Any]]:
+        """Return `records_jsonpath`, compiled once for the stream."""
+        return compile_jsonpath(self.records_jsonpath)
+
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        for row in super().parse_response(response):
+        for row in self.records_extractor(response.json()):
             row = self.standardize_data(row)
             yield row
 
     def standardize_data(self, row: dict) -> dict:
-        row_copy = copy.deepcopy(row)
-        row_copy = self.nullify_temporal_data(row=row_copy)
-        row_copy = self.standardize_boolean_data(row=row_copy)
-        return row_copy
-
-    def nullify_temporal_data(self, row: dict) -> dict:
-        row_copy = copy.deepcopy(row)
-        illegal_values = {"", "0000-00-00"}
-        for field in row_copy:
-            if field in self.temporal_fields and row_copy[field] in illegal_values:
-                row_copy[field] = None
-        return row_copy
-
-    def standardize_boolean_data(self, row: dict) -> dict:
-        row_copy = copy.deepcopy(row)
-        for field in row_copy:
-            if field in self.boolean_fields:
-                if row_copy[field] == "true":
-                    row_copy[field] = True
-                elif row_copy[field] == "false":
-                    row_copy[field] = False
-        return row_copy
+        """Standardize temporal and boolean values of a row in place."""
+        start = time.perf_counter() if self.record_timings else None
+        converters = self.field_converters
+        for field, value in row.items():
+            converter = converters.get(field)
+            if converter is not None:
+                row[field] = converter(value)
+        if start is not None:
+            self.timings.add("standardize", time.perf_counter() - start)
+        return row
+
+
+def format_timestamp(value: datetime) -> str:
+    """Format a timestamp the way the BambooHR API expects it in filters."""
+    return value.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def add_months(day: date, months: int) -> date:
+    """Return the same day `months` later, or the last day of a shorter month."""
+    month_index = day.month - 1 + months
+    year = day.year + month_index // 12
+    month = month_index % 12 + 1
+    last_day = calendar.monthrange(year, month)[1]
+    return day.replace(year=year, month=month, day=min(day.day, last_day))
+
+
+def nullify_temporal_value(value: Any) -> Any:
+    """Return None for the placeholder values BambooHR uses for empty dates."""
+    if value == "" or value == "0000-00-00":
+        return None
+    return value
+
+
+def standardize_boolean_value(value: Any) -> Any:
+    """Convert BambooHR's "true"/"false" strings to booleans."""
+    if value == "true":
+        return True
+    if value == "false":
+        return False
+    return value
+
+
+def parse_integer(value: Any) -> int:
+    """Convert a BambooHR integer, e.g. "1,200", raising ValueError if invalid."""
+    if isinstance(value, int):
+        return value
+    text = str(value).replace(",", "").strip()
+    try:
+        return int(text)
+    except ValueError:
+        number = float(text)
+        if not number.is_integer():
+            raise
+        return int(number)
+
+
+def parse_number(value: Any) -> float:
+    """Convert a BambooHR number, e.g. "1,200.50", raising ValueError if invalid."""
+    if isinstance(value, (int, float)):
+        return value
+    return float(str(value).replace(",", "").strip())
+
+
+def parse_currency(value: Any) -> dict:
+    """Split a BambooHR currency value, e.g. "65000.00 USD", into its parts.
+
+    Raises ValueError if invalid.
+    """
+    if isinstance(value, dict):
+        return {
+            "value": parse_number(value["value"]),
+            "currency": value.get("currency"),
+        }
+    match = CURRENCY_PATTERN.fullmatch(str(value).strip())
+    if not match:
+        raise ValueError(f"Invalid currency value: {value!r}")
+    currency = match["currency"]
+    return {
+        "value": parse_number(match["value"]),
+        "currency": currency.upper() if currency else None,
+    }
 
 
 class Lists(TapBambooHRStream):
-    """Not for direct use: should be subclassed."""
+    """Not for direct use: should be subclassed.
+
+    The /meta/lists response holds every list field, so it is requested once per run
+    and shared by all list streams. Each subclass picks its list out by `list_alias`;
+    adding a list only takes a subclass with a `name` and a `list_alias`.
+    """
 
     path = "/meta/lists"
     primary_keys = ["id"]
     replication_key = None
     schema_filepath = SCHEMAS_DIR / "lists.json"
+    list_alias: str
+
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        options_by_alias = self.tap.get_shared(
+            self.path, lambda: self.request_options_by_alias(context)
+        )
+        for option in options_by_alias.get(self.list_alias, []):
+            # Options are shared with the other list streams, so work on a copy
+            record = self.standardize_data(dict(option))
+            transformed_record = self.post_process(record, context)
+            if transformed_record is None:
+                # Record filtered out during post_process()
+                continue
+            yield transformed_record
+
+    def request_options_by_alias(self, context: dict | None) -> Dict[str, list]:
+        """Request all lists and index their options by list alias."""
+        return {
+            list_field.get("alias"): list_field.get("options", [])
+            for list_field in self.request_records(context)
+        }
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        yield from response.json()
 
 
 class JobTitles(Lists):
     name = "jobtitles"
-    records_jsonpath = "$[?(@.alias=='jobTitle')].options[*]"
+    list_alias = "jobTitle"
 
 
 class LocationsList(Lists):
     name = "locations"
-    records_jsonpath = "$[?(@.alias=='location')].options[*]"
+    list_alias = "location"
 
 
 class Divisions(Lists):
     name = "divisions"
-    records_jsonpath = "$[?(@.alias=='division')].options[*]"
+    list_alias = "division"
 
 
 class Departments(Lists):
     name = "departments"
-    records_jsonpath = "$[?(@.alias=='department')].options[*]"
+    list_alias = "department"
 
 
 class EmploymentStatuses(Lists):
     name = "employmentstatuses"
-    records_jsonpath = "$[?(@.alias=='employmentHistoryStatus')].options[*]"
+    list_alias = "employmentHistoryStatus"
 
 
 class Employees(TapBambooHRStream):
@@ -138,6 +977,7 @@ class Employees(TapBambooHRStream):
     primary_keys = ["id"]
     records_jsonpath = "$.employees[*]"
     replication_key = None
+    supports_snapshot_diff = True
     schema_filepath = SCHEMAS_DIR / "directory.json"
 
 
@@ -151,11 +991,22 @@ class LocationsDetail(TapBambooHRStream):
 
 
 class CustomReport(TapBambooHRStream):
+    """A custom report, with the fields and filters of a `custom_reports` entry.
+
+    With `fields_per_request`, the fields are split into groups requested
+    separately, `custom_report_concurrency` at a time, and joined back on `id`.
+    Each group is retried on its own if its request fails.
+    """
+
     path = "/reports/custom"
     primary_keys = ["id"]
     records_jsonpath = "$.employees[*]"
     replication_key = None
     rest_method = "POST"
+    supports_streaming = True
+    uses_change_feed = True
+    supports_snapshot_diff = True
+    concurrency_setting = "custom_report_concurrency"
 
     def __init__(
         self,
@@ -166,19 +1017,58 @@ class CustomReport(TapBambooHRStream):
         custom_report_config: dict = {},
     ) -> None:
         self._custom_report_config = custom_report_config
+        if custom_report_config.get("incremental", False):
+            self.replication_key = "lastChanged"
         super().__init__(name=name, schema=schema, tap=tap, path=path)
 
-    @property
+    @cached_property
     def schema(self):
+        """Return the report schema, built once from the configured fields.
+
+        The fields are validated first, see `validate_fields`.
+        """
+        self.validate_fields()
         list_of_fields = self.field_list
         list_of_properties = []
         for field in list_of_fields:
             list_of_properties.append(typing.Property(field["name"], field["type"]))
         return typing.PropertiesList(*list_of_properties).to_dict()
 
+    @cached_property
+    def report_fields(self) -> t.List[str]:
+        """Return the fields requested in the report.
+
+        Incremental reports always request `lastChanged`, their replication key.
+        """
+        fields = list(self.custom_report_config.get("fields", []))
+        if self.replication_key and self.replication_key not in fields:
+            fields.append(self.replication_key)
+        return fields
+
+    @cached_property
+    def field_groups(self) -> t.List[t.List[str]]:
+        """Return the groups of fields requested together, in order.
+
+        All fields are requested at once unless `fields_per_request` is set. The
+        replication key is always requested in the first group, as the employees it
+        returns are the ones synced.
+        """
+        fields = self.report_fields
+        group_size = self.custom_report_config.get("fields_per_request")
+        if not group_size or len(fields) <= group_size:
+            return [fields]
+        if self.replication_key:
+            fields = [self.replication_key] + [
+                field for field in fields if field != self.replication_key
+            ]
+        return [
+            fields[index : index + group_size]
+            for index in range(0, len(fields), group_size)
+        ]
+
     @cached_property
     def field_list(self):
-        list_of_field_names = self.custom_report_config.get("fields", [])
+        list_of_field_names = self.report_fields
         list_of_field_dicts = []
         for field_name in list_of_field_names:
             list_of_field_dicts.append(
@@ -189,37 +1079,142 @@ class CustomReport(TapBambooHRStream):
             )
         return list_of_field_dicts
 
+    @cached_property
+    def field_metadata(self) -> Optional[Dict[str, dict]]:
+        """Return the fields of the account, if `report_field_metadata` is set.
+
+        Indexed by canonical id and alias, see `index_field_metadata`.
+        """
+        if not self.config.get("report_field_metadata"):
+            return None
+        return self.tap.field_metadata()
+
+    def validate_fields(self) -> None:
+        """Check that the fields of the report exist, before requesting it.
+
+        Fields are looked up in /meta/fields when `report_field_metadata` is set,
+        and in field_types.json for the fields of reports it leaves out, such as
+        `id`. Unknown fields fail discovery, or are logged when `field_mismatch` is
+        `ignore`.
+        """
+        metadata = self.field_metadata
+        if metadata is None:
+            return
+        known_fields = get_field_types()
+        unknown_fields = [
+            field
+            for field in self.report_fields
+            if canonical_field_name(field) not in metadata
+            and canonical_field_name(field) not in known_fields
+        ]
+        if not unknown_fields:
+            return
+        names = sorted(
+            {field["alias"] for field in metadata.values() if field.get("alias")}
+        )
+        descriptions = []
+        for field in unknown_fields:
+            matches = difflib.get_close_matches(str(field), names, n=1)
+            descriptions.append(
+                f"{field} (did you mean {matches[0]}?)" if matches else str(field)
+            )
+        msg = (
+            f"The fields of {self.name} were not found in the field metadata of "
+            f"the account: {', '.join(descriptions)}."
+        )
+        if self.config["field_mismatch"] == "fail":
+            raise ValueError(
+                f"{msg} To suppress this error, change the field_mismatch config "
+                "option to 'ignore'."
+            )
+        self.logger.warning(msg)
+
     def get_field_type(self, field_name: str) -> str:
         """Takes the name of a BambooHR field and finds its JSON data type.
 
-        Canonicalizes a field name, checks if its in the field_types.json file, and if
-        so, returns that type. Otherwise, returns string.
+        Canonicalizes a field name, and looks up its type in the field metadata of
+        the account when `report_field_metadata` is set, then in the
+        field_types.json file. Defaults to string.
         """
-        with open(str(Path(__file__).parent / Path("./field_types.json"))) as file:
-            return self.bamboohr_type_to_jsonschema_type(
-                json.load(file).get(self.canonical_field_name(field_name), "string")
+        field_name = canonical_field_name(field_name)
+        metadata = self.field_metadata
+        if metadata is not None and field_name in metadata:
+            return self.metadata_type_to_jsonschema_type(
+                metadata[field_name].get("type")
             )
+        return self.bamboohr_type_to_jsonschema_type(
+            get_field_types().get(field_name, "string")
+        )
 
-    def canonical_field_name(self, field_name: int | str) -> str:
-        """Converts an ambiguous field name into a single unambiguous name.
+    def metadata_type_to_jsonschema_type(
+        self, bamboohr_type: Optional[str]
+    ) -> typing.JSONTypeHelper:
+        """Converts a BambooHR type of /meta/fields to a precise JSON type.
 
-        Args:
-            field_name: The field name to convert. Can be in any of the following
-            formats: "name", "123", "123.0", or 123
+        Unlike `bamboohr_type_to_jsonschema_type`, integers, numbers and currencies
+        get their own types. Their values are converted by `field_converters`.
+        """
+        if bamboohr_type in INTEGER_FIELD_TYPES:
+            return typing.IntegerType
+        if bamboohr_type in NUMBER_FIELD_TYPES:
+            return typing.NumberType
+        if bamboohr_type == "currency":
+            return typing.ObjectType(
+                typing.Property("value", typing.NumberType),
+                typing.Property("currency", typing.StringType),
+            )
+        return self.bamboohr_type_to_jsonschema_type(bamboohr_type or "string")
 
-        Returns:
-            An unambiguous name in the format: "name" or "123.0".
+    @cached_property
+    def field_converters(self) -> Dict[str, t.Callable[[Any], Any]]:
+        """Map each field needing standardization to its converter.
+
+        Integer, number and currency values are converted from the strings
+        returned in reports. Invalid values are replaced by null, logging a warning.
         """
-        if not isinstance(field_name, (int, str)):
-            msg = "Field name cannot be canonicalized because it is not int or str."
-            raise TypeError(msg)
-        if isinstance(field_name, str):
+        converters = dict(super().field_converters)
+        parsers: Dict[str, t.Callable[[Any], Any]] = {}
+        for field, properties in self.schema["properties"].items():
+            types = properties.get("type", [])
+            if "integer" in types:
+                parsers[field] = parse_integer
+            elif "number" in types:
+                parsers[field] = parse_number
+            elif "object" in types and "currency" in properties.get("properties", {}):
+                parsers[field] = parse_currency
+        for field, parse in parsers.items():
+            converters[field] = self.nullify_invalid(field, parse)
+        return converters
+
+    def nullify_invalid(
+        self, field: str, parse: t.Callable[[Any], Any]
+    ) -> t.Callable[[Any], Any]:
+        """Wrap a parser so that empty and invalid values convert to null."""
+        warned = False
+
+        def convert(value: Any) -> Any:
+            nonlocal warned
+            if value is None or value == "":
+                return None
             try:
-                field_name = int(field_name)
-            except ValueError:
-                return field_name
-        if isinstance(field_name, int):
-            return format(field_name, ".1f")
+                return parse(value)
+            except (KeyError, TypeError, ValueError):
+                if not warned:
+                    self.logger.warning(
+                        f"Replacing invalid values of {field} in {self.name} with "
+                        f"null, such as {value!r}."
+                    )
+                    warned = True
+                return None
+
+        return convert
+
+    def canonical_field_name(self, field_name: int | str) -> str:
+        """Converts an ambiguous field name into a single unambiguous name.
+
+        See `canonical_field_name` at module level.
+        """
+        return canonical_field_name(field_name)
 
     def bamboohr_type_to_jsonschema_type(
         self, bamboohr_type: str
@@ -257,44 +1252,155 @@ class CustomReport(TapBambooHRStream):
     def prepare_request_payload(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Optional[dict]:
-        return self.custom_report_config
+        """Return the report definition, filtered on the bookmark if incremental."""
+        payload = dict(self.custom_report_config, fields=self.report_fields)
+        payload.pop("incremental", None)
+        payload.pop("fields_per_request", None)
+        if self.replication_method == REPLICATION_INCREMENTAL:
+            start = self.get_starting_timestamp(context)
+            if start:
+                filters = dict(payload.get("filters") or {})
+                last_changed = dict(filters.get("lastChanged") or {})
+                last_changed.setdefault("includeNull", "no")
+                last_changed["value"] = format_timestamp(start)
+                filters["lastChanged"] = last_changed
+                payload["filters"] = filters
+        return payload
 
-    def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        json_response = response.json()
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        if self.nothing_changed():
+            return
+        if len(self.field_groups) == 1:
+            yield from super().get_records(context)
+            return
+        for record in self.request_grouped_records(context):
+            transformed_record = self.post_process(record, context)
+            if transformed_record is None:
+                # Record filtered out during post_process()
+                continue
+            yield transformed_record
+
+    def request_grouped_records(self, context: dict | None) -> t.List[dict]:
+        """Request each group of fields separately and join the rows on `id`.
+
+        Rows are returned for the employees of the first group, in its order.
+        """
+        request_fields = self.request_decorator(self.request_fields)
+        futures = [
+            self.executor.submit(request_fields, fields, context)
+            for fields in self.field_groups
+        ]
+        try:
+            rows = futures[0].result()
+            rows_by_id = {row["id"]: row for row in rows}
+            for future in futures[1:]:
+                for row in future.result():
+                    joined_row = rows_by_id.get(row["id"])
+                    if joined_row is not None:
+                        joined_row.update(row)
+        finally:
+            for future in futures:
+                future.cancel()
+        return rows
+
+    def request_fields(self, fields: t.List[str], context: dict | None) -> t.List[dict]:
+        """Request the report with only some of its fields, and parse all its rows.
+
+        Not retried by itself: wrap it in `request_decorator`, so that a failure
+        while reading the response is retried too.
+        """
+        payload = self.prepare_request_payload(context, None) or {}
+        payload["fields"] = fields
+        prepared_request = self.build_prepared_request(
+            method=self.rest_method,
+            url=self.get_url(context),
+            params=self.get_url_params(context, None),
+            headers=self.http_headers,
+            json=payload,
+        )
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            response = self._request(prepared_request, context)
+            request_counter.increment()
+        self.update_sync_costs(prepared_request, response, context)
+        try:
+            return list(self.parse_timed(response, context))
+        finally:
+            response.close()
 
-        if self.config["field_mismatch"] == "fail":
-            fields_config = set(
-                [
-                    self.canonical_field_name(field)
-                    for field in self.custom_report_config["fields"]
-                ]
-            )
-            fields_returned = set(
-                [
-                    self.canonical_field_name(field)
-                    for field in extract_jsonpath("$.fields[*].id", json_response)
-                ]
-            )
-            matching = fields_config.intersection(fields_returned)
-            config_diff = fields_config.difference(fields_returned)
-            returned_diff = fields_returned.difference(fields_config)
-            if fields_config != fields_returned:
-                msg = (
-                    f"The fields returned by the API for {self.name} did not match the "
-                    "fields selected. The matching fields were: "
-                    f"{matching if matching else 'N/A'}. The fields selected for a "
-                    "custom report but not returned were: "
-                    f"{config_diff if config_diff else 'N/A'}. The fields returned but "
-                    "not selected for a custom report were: "
-                    f"{returned_diff if returned_diff else 'N/A'}. To suppress this "
-                    "error, change the field_mismatch config option to 'ignore'."
-                )
-                raise RuntimeError(msg)
+    @staticmethod
+    def requested_fields(response: requests.Response) -> t.List[str]:
+        """Return the fields requested in the report request of a response."""
+        return json.loads(response.request.body or b"{}").get("fields", [])
 
-        for row in extract_jsonpath(self.records_jsonpath, json_response):
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        if self.stream_response:
+            yield from self.parse_streamed_response(response)
+            return
+
+        json_response = response.json()
+        self.check_fields_returned(
+            compile_jsonpath("$.fields[*].id")(json_response),
+            self.requested_fields(response),
+        )
+        for row in self.records_extractor(json_response):
             row = self.standardize_data(row)
             yield row
 
+    def parse_streamed_response(self, response: requests.Response) -> Iterable[dict]:
+        """Yield employees one at a time from a streamed custom report response.
+
+        BambooHR sends the `fields` header before `employees`, so the field check
+        happens before the first row is emitted.
+        """
+        fields_requested = self.requested_fields(response)
+        fields_returned = []
+        fields_checked = False
+        for key, item in iter_top_level_items(response, ("fields", "employees")):
+            if key == "fields":
+                fields_returned.append(item.get("id"))
+                continue
+            if not fields_checked:
+                self.check_fields_returned(fields_returned, fields_requested)
+                fields_checked = True
+            yield self.standardize_data(item)
+        if not fields_checked:
+            self.check_fields_returned(fields_returned, fields_requested)
+
+    def check_fields_returned(
+        self,
+        field_ids: Iterable[int | str],
+        fields_requested: Optional[Iterable[str]] = None,
+    ) -> None:
+        """Raise if the fields returned by the API differ from the requested ones.
+
+        Checks against all fields of the report unless `fields_requested` is given.
+        Does nothing when the `field_mismatch` setting is `ignore`.
+        """
+        if self.config["field_mismatch"] != "fail":
+            return
+        if fields_requested is None:
+            fields_requested = self.report_fields
+        fields_config = set(
+            [self.canonical_field_name(field) for field in fields_requested]
+        )
+        fields_returned = set([self.canonical_field_name(field) for field in field_ids])
+        matching = fields_config.intersection(fields_returned)
+        config_diff = fields_config.difference(fields_returned)
+        returned_diff = fields_returned.difference(fields_config)
+        if fields_config != fields_returned:
+            msg = (
+                f"The fields returned by the API for {self.name} did not match the "
+                "fields selected. The matching fields were: "
+                f"{matching if matching else 'N/A'}. The fields selected for a "
+                "custom report but not returned were: "
+                f"{config_diff if config_diff else 'N/A'}. The fields returned but "
+                "not selected for a custom report were: "
+                f"{returned_diff if returned_diff else 'N/A'}. To suppress this "
+                "error, change the field_mismatch config option to 'ignore'."
+            )
+            raise RuntimeError(msg)
+
     def get_new_paginator(self) -> SinglePagePaginator:
         return SinglePagePaginator()
 
@@ -306,6 +1412,7 @@ class PhotosUsers(TapBambooHRStream):
     replication_key = None
     rest_method = "POST"
     schema_filepath = SCHEMAS_DIR / "photos_users.json"
+    supports_snapshot_diff = True
 
     # Recommended path for pulling bulk employee data. From the docs: "If you're trying
     # to get employee data in bulk (for all employees), we recommend using the request a
@@ -313,17 +1420,140 @@ class PhotosUsers(TapBambooHRStream):
     # https://documentation.bamboohr.com/reference/get-employee
     path = "/reports/custom"
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._pending_fingerprints: Dict[str, str] = {}
+        self._unchanged_photos = 0
+        self._employee_changes: Optional[Dict[str, datetime]] = None
+
     def get_child_context(
         self,
         record: dict,
         context: Optional[dict],  # noqa: ARG002
-    ) -> dict:
-        """Return a context dictionary for child streams."""
+    ) -> Optional[dict]:
+        """Return a context dictionary for child streams.
+
+        Returns None for employees the change feed shows unchanged since the last
+        run, and with `photo_skip_unchanged`, for employees whose photo fingerprint
+        matches the one recorded by a prior run, so their photo is not requested
+        again.
+        """
+        changes = self._employee_changes
+        if changes is not None and record["id"] not in changes:
+            return None
+        if self.skip_unchanged:
+            fingerprint = self.photo_fingerprint(record)
+            if self.photo_fingerprints.get(record["id"]) == fingerprint:
+                return None
+            self._pending_fingerprints[record["id"]] = fingerprint
         return {
             "_sdc_id": record["id"],
             "_sdc_isPhotoUploaded": record.get("isPhotoUploaded", False),
         }
 
+    def _sync_children(self, child_context: dict | None) -> None:
+        if child_context is None:
+            # Photo unchanged since the last run, see get_child_context()
+            self._unchanged_photos += 1
+            return
+        super()._sync_children(child_context)
+        # Only recorded once the photo was synced, so a failed run retries it
+        employee_id = child_context["_sdc_id"]
+        fingerprint = self._pending_fingerprints.pop(employee_id, None)
+        if fingerprint is not None:
+            self.photo_fingerprints[employee_id] = fingerprint
+
+    @cached_property
+    def photo_streams(self) -> t.List[Photos]:
+        return [
+            child
+            for child in self.child_streams
+            if isinstance(child, Photos) and child.selected
+        ]
+
+    @property
+    def skip_unchanged(self) -> bool:
+        return self.config.get("photo_skip_unchanged", False) and bool(
+            self.photo_streams
+        )
+
+    @property
+    def change_feed_since(self) -> Optional[datetime]:
+        """Return the time photos were last synced from, if synced before."""
+        since = self.stream_state.get("change_feed_since")
+        if not self.photo_streams or not since:
+            return None
+        return datetime.fromisoformat(since)
+
+    @property
+    def photo_fingerprints(self) -> Dict[str, str]:
+        """Fingerprints of the employees' photos synced by prior runs, by id."""
+        return self.stream_state.setdefault("photo_fingerprints", {})
+
+    def photo_fingerprint(self, record: dict) -> str:
+        """Return a short hash of the fields that change along with a photo."""
+        values = [self.config["photo_size"]]
+        values.extend(record.get(field) for field in PHOTO_FINGERPRINT_FIELDS)
+        return hashlib.sha256(json.dumps(values).encode("utf-8")).hexdigest()[:16]
+
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        started = datetime.now(timezone.utc) - CHANGE_FEED_OVERLAP
+        self._employee_changes = self.changed_employees()
+        records = self.prefetch_photos(super().get_records(context))
+        if not self.skip_unchanged and self._employee_changes is None:
+            yield from records
+        else:
+            self._unchanged_photos = 0
+            seen = set()
+            for record in records:
+                seen.add(record["id"])
+                yield record
+            if self.skip_unchanged:
+                # Forget employees no longer returned by the API
+                fingerprints = self.photo_fingerprints
+                for employee_id in set(fingerprints) - seen:
+                    del fingerprints[employee_id]
+            self.logger.info(
+                f"Skipped the photos of {self._unchanged_photos} unchanged employees"
+            )
+        if self.config.get("employee_change_feed", False) and self.photo_streams:
+            # Only recorded once all photos were synced, so a failed run retries them
+            self.stream_state["change_feed_since"] = started.isoformat()
+
+    def prefetch_photos(
+        self, records: t.Iterable[dict[str, t.Any]]
+    ) -> t.Iterable[dict[str, t.Any]]:
+        """Prefetch photos ahead of the records being synced.
+
+        With `photo_concurrency` above 1, photo requests for the next records are
+        started in the background while earlier records are synced, so records (and
+        the photos of their children) are still emitted in order. Only the photos of
+        children to be synced are prefetched, and any left once the records were
+        synced, or the sync stopped, are discarded.
+        """
+        concurrency = self.config.get("photo_concurrency", 1)
+        if concurrency <= 1 or not self.photo_streams:
+            yield from records
+            return
+
+        pending: deque = deque()
+        try:
+            for record in records:
+                child_context = self.get_child_context(record, None)
+                if child_context is not None and not self.children_completed(
+                    child_context
+                ):
+                    for child in self.photo_streams:
+                        child.prefetch(child_context)
+                pending.append(record)
+                if len(pending) > concurrency:
+                    yield pending.popleft()
+            while pending:
+                yield pending.popleft()
+        finally:
+            for child in self.photo_streams:
+                child.discard_prefetched()
+
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
@@ -337,6 +1567,7 @@ class PhotosUsers(TapBambooHRStream):
             "fields": [
                 "id",
                 "isPhotoUploaded",
+                "lastChanged",
             ],
         }
 
@@ -351,6 +1582,7 @@ class Photos(TapBambooHRStream):
     replication_key = None
     schema_filepath = SCHEMAS_DIR / "photos.json"
     parent_stream_type = PhotosUsers
+    concurrency_setting = "photo_concurrency"
 
     @cached_property
     def path(self):
@@ -360,53 +1592,275 @@ class Photos(TapBambooHRStream):
             raise ValueError(f"Photo size of `{photo_size}` is not valid.")
         return f"/employees/{{_sdc_id}}/photo/{photo_size}"
 
-    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
-        """Override to provide no records if no photo exists.
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._prefetched: Dict[Any, Future] = {}
+
+    @property
+    def stream_response(self) -> bool:
+        """Photos are always streamed, so they are never held in memory unencoded."""
+        return True
+
+    @cached_property
+    def photo_cache(self) -> Optional[PhotoCache]:
+        """Return the on-disk photo cache, if `photo_cache_dir` is configured."""
+        directory = self.config.get("photo_cache_dir")
+        if not directory:
+            return None
+        max_age_days = self.config.get("photo_cache_max_age_days")
+        cache = PhotoCache(
+            directory,
+            max_bytes=self.config.get("photo_cache_max_bytes"),
+            max_age=max_age_days * 24 * 60 * 60 if max_age_days else None,
+        )
+        cache.evict()
+        return cache
+
+    @property
+    def changed_only(self) -> bool:
+        return self.config.get("photo_changed_only", False)
+
+    def prefetch(self, context: dict) -> None:
+        """Start fetching the photo for `context` in the background.
+
+        The result is picked up by `get_records` when the SDK syncs that context.
+        """
+        self.path  # Resolve the cached properties before worker threads use them
+        self.photo_cache
+        self.photo_output_dir
+        self._prefetched[context["_sdc_id"]] = self.executor.submit(
+            self.fetch_records, context, self.previous_photo_state(context)
+        )
+
+    def discard_prefetched(self) -> None:
+        """Cancel and forget the photos prefetched for contexts that were not synced."""
+        if self._prefetched:
+            self.logger.debug(
+                f"Discarding {len(self._prefetched)} prefetched photos not synced"
+            )
+        for future in self._prefetched.values():
+            future.cancel()
+        self._prefetched.clear()
 
-        Without this, the API fails with a 404.
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        future = self._prefetched.pop(context.get("_sdc_id"), None)
+        if future is not None:
+            records, photo_state = future.result()
+        else:
+            records, photo_state = self.fetch_records(
+                context, self.previous_photo_state(context)
+            )
+        if self.changed_only and photo_state is not None:
+            self.get_context_state(context)["photo"] = photo_state
+        yield from records
+
+    def previous_photo_state(self, context: dict) -> Optional[dict]:
+        """Return the validators of the photo emitted for `context` by a prior run."""
+        if not self.changed_only:
+            return None
+        return self.get_context_state(context).get("photo")
+
+    def fetch_records(
+        self, context: dict, previous: Optional[dict] = None
+    ) -> t.Tuple[t.List[dict], Optional[dict]]:
+        """Return the photo records of one employee and the photo's validators.
+
+        Provides no request and a null photo if no photo is uploaded, and no records
+        if the photo cannot be found. Without this, the API fails with a 404.
         """
+        if not context.get("_sdc_isPhotoUploaded", False):
+            record = {"photo": None}
+            record.update(context)
+            return [record], None
         try:
-            if context.get("_sdc_isPhotoUploaded", False):
-                for record in self.request_records(context):
-                    transformed_record = self.post_process(record, context)
-                    if transformed_record is None:
-                        # Record filtered out during post_process()
-                        continue
-                yield transformed_record
-            else:
-                record = {"photo": None}
-                record.update(context)
-                yield record
+            record, photo_state = self.request_photo(context, previous)
         except self.NoPhotoFound:
-            self.logger.warning(f"No photo found for employee, skipping {context.get('_sdc_id')}")
-            pass
+            self.logger.warning(
+                f"No photo found for employee, skipping {context.get('_sdc_id')}"
+            )
+            return [], None
+        if record is None:
+            return [], photo_state
+        transformed_record = self.post_process(record, context)
+        if transformed_record is None:
+            # Record filtered out during post_process()
+            return [], photo_state
+        return [transformed_record], photo_state
+
+    def request_photo(
+        self, context: dict, previous: Optional[dict]
+    ) -> t.Tuple[Optional[dict], dict]:
+        """Request the photo of one employee, revalidating any known copy.
+
+        When the photo is cached on disk, or was emitted by a prior run, the request
+        is sent with If-None-Match/If-Modified-Since so an unchanged photo costs a
+        304 without a body.
+
+        Args:
+            context: The child context of the employee.
+            previous: Validators of the photo emitted by a prior run, if any.
+
+        Returns:
+            The photo record, or None if the photo did not change since it was last
+            emitted and `photo_changed_only` is set, and the photo's validators.
+        """
+        cache = self.photo_cache
+        employee_id = context["_sdc_id"]
+        photo_size = self.config["photo_size"]
+        cached = cache.get(employee_id, photo_size) if cache else None
+        known = cached or previous
+
+        prepared_request = self.prepare_request(context, next_page_token=None)
+        if known and known.get("etag"):
+            prepared_request.headers["If-None-Match"] = known["etag"]
+        if known and known.get("last_modified"):
+            prepared_request.headers["If-Modified-Since"] = known["last_modified"]
+        decorated_request = self.request_decorator(self._request)
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            request_counter.context = context
+            response = decorated_request(prepared_request, context)
+            request_counter.increment()
+        self.update_sync_costs(prepared_request, response, context)
+
+        start = time.perf_counter()
+        try:
+            if response.status_code == HTTPStatus.NOT_MODIFIED and known:
+                photo_state = {
+                    "etag": known.get("etag"),
+                    "last_modified": known.get("last_modified"),
+                    "sha256": known["sha256"],
+                }
+                if cached:
+                    assert cache is not None
+                    cache.revalidated(employee_id, photo_size, cached)
+                if (
+                    self.changed_only
+                    and previous
+                    and previous["sha256"] == known["sha256"]
+                ):
+                    return None, photo_state
+                # Validators of a prior run are only sent with `photo_changed_only`,
+                # so the photo is emitted again from the cache
+                assert cache is not None and cached is not None
+                photo = self.read_photo(iter_file(cache.blob_path(cached)), cached=True)
+                self.timings.add_response(time.perf_counter() - start, 1, 0)
+                return self.photo_record(photo), photo_state
+
+            photo = self.read_photo(response.iter_content(CHUNK_SIZE))
+        finally:
+            response.close()
+        self.timings.add_response(time.perf_counter() - start, 1, photo["size"])
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if cache:
+            cache.put(employee_id, photo_size, photo["sha256"], etag, last_modified)
+        photo_state = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "sha256": photo["sha256"],
+        }
+        if self.changed_only and previous and previous["sha256"] == photo["sha256"]:
+            return None, photo_state
+        return self.photo_record(photo), photo_state
+
+    @property
+    def photo_output(self) -> str:
+        return self.config.get("photo_output", "base64")
+
+    @cached_property
+    def photo_output_dir(self) -> Optional[Path]:
+        if self.photo_output != "file":
+            return None
+        directory = self.config.get("photo_output_dir")
+        if not directory:
+            raise ValueError(
+                "`photo_output_dir` is required when `photo_output` is file."
+            )
+        path = Path(directory)
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def read_photo(self, chunks: Iterable[bytes], cached: bool = False) -> dict:
+        """Read the bytes of a photo once, in chunks.
+
+        The bytes are hashed, base64 encoded when `photo_output` is base64, and
+        written to the photo cache and, when `photo_output` is file, to
+        `photo_output_dir` as they are read.
+
+        Args:
+            chunks: The photo's bytes, in chunks.
+            cached: Whether the bytes are read from the photo cache.
+        """
+        cache = self.photo_cache
+        directory = None
+        if cache and not cached:
+            directory = cache.blobs_dir
+        elif not cache:
+            directory = self.photo_output_dir
+        photo = read_photo(
+            chunks, encode=self.photo_output == "base64", directory=directory
+        )
+        if cache and self.photo_output_dir:
+            photo["path"] = read_photo(
+                iter_file(cache.blob_path(photo)), directory=self.photo_output_dir
+            )["path"]
+        return photo
+
+    def photo_record(self, photo: dict) -> dict:
+        """Return the record of a photo read by `read_photo`."""
+        width, height = photo["dimensions"] or (None, None)
+        record = {
+            "photo": photo["base64"],
+            "photo_sha256": photo["sha256"],
+            "photo_size_bytes": photo["size"],
+            "photo_width": width,
+            "photo_height": height,
+        }
+        if self.photo_output == "file":
+            record["photo_path"] = str(photo["path"])
+        return record
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        yield {"photo": base64.b64encode(response.content).decode("utf-8")}
-    
+        yield self.photo_record(self.read_photo(response.iter_content(CHUNK_SIZE)))
+
     class NoPhotoFound(Exception):
         pass
 
     def validate_response(self, response: requests.Response) -> None:
         if response.status_code == HTTPStatus.NOT_FOUND:
+            response.close()
             raise self.NoPhotoFound()
         super().validate_response(response)
 
 
-# A more generic tables stream would be better, there is a table metadata api
-class EmploymentHistoryStatus(TapBambooHRStream):
-    name = "tables_employmentstatus"
-    path = "/employees/changed/tables/employmentStatus"
-    primary_keys = ["employee_id", "date", "employmentStatus"]
-    replication_key = None
-    schema_filepath = SCHEMAS_DIR / "employmentstatus.json"
+class EmployeeTable(TapBambooHRStream):
+    """Not for direct use: should be subclassed.
+
+    Rows of an employee table, returned by the API keyed by employee id. Syncs
+    incrementally on the employees' `lastChanged`, unless the catalog forces the
+    `FULL_TABLE` replication method.
+    """
+
+    replication_key = "lastChanged"
+    supports_streaming = True
+    uses_change_feed = True
+
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        if self.nothing_changed():
+            return
+        yield from super().get_records(context)
 
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
-        return {
-            "since": "2012-01-01T00:00:00Z"
-        }  # I want all of the data, 2012 is far enough back and referenced in the API Docs
+        # Without a bookmark we want all of the data, 2012 is far enough back and
+        # referenced in the API Docs
+        since = "2012-01-01T00:00:00Z"
+        if self.replication_method == REPLICATION_INCREMENTAL:
+            start = self.get_starting_timestamp(context)
+            if start:
+                since = format_timestamp(start)
+        return {"since": since}
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
         """Parse the response and return an iterator of result rows.
@@ -420,17 +1874,146 @@ class EmploymentHistoryStatus(TapBambooHRStream):
         .. _requests.Response:
             https://docs.python-requests.org/en/latest/api/#requests.Response
         """
-        for employeeid, value in response.json()["employees"].items():
+        if self.stream_response:
+            employees = iter_map_items(response, "employees")
+        else:
+            employees = response.json()["employees"].items()
+        standardize_data = self.standardize_data
+        for employeeid, value in employees:
             last_changed = value["lastChanged"]
-            rows = value.get("rows", [])
-            for row in rows:
-                row.update({"lastChanged": last_changed})
-                row.update({"employee_id": employeeid})
-                row = self.standardize_data(row)
-                yield row
+            for row in value.get("rows", []):
+                row["lastChanged"] = last_changed
+                row["employee_id"] = employeeid
+                yield standardize_data(row)
+
+
+class GenericEmployeeTable(EmployeeTable):
+    """An employee table stream generated from the table metadata API.
+
+    See `TablesMetadata` and the `employee_tables` setting.
+    """
+
+    def __init__(self, tap: Tap, table: dict) -> None:
+        alias = table["alias"]
+        super().__init__(
+            tap=tap,
+            name=f"tables_{alias.lower()}",
+            schema=self.table_schema(table),
+            path=f"/employees/changed/tables/{alias}",
+        )
+        self.primary_keys = self.table_keys(table)
+
+    @staticmethod
+    def table_keys(table: dict) -> t.List[str]:
+        """Return the default keys of a table: `employee_id`, and its first date.
+
+        Rows are dated by their first date field, such as `date` or `startDate`,
+        when the table has one. Other keys can be set in the catalog.
+        """
+        for field in table.get("fields", []):
+            if field.get("type") == "date" and field.get("alias") != "employee_id":
+                return ["employee_id", field["alias"]]
+        return ["employee_id"]
+
+    @classmethod
+    def table_schema(cls, table: dict) -> dict:
+        """Build the schema of a table from its field metadata."""
+        properties = [
+            typing.Property("employee_id", typing.StringType),
+            typing.Property("lastChanged", typing.DateTimeType),
+        ]
+        for field in table.get("fields", []):
+            if field.get("alias") in ("employee_id", "lastChanged"):
+                continue
+            properties.append(
+                typing.Property(field["alias"], cls.field_type(field.get("type")))
+            )
+        return typing.PropertiesList(*properties).to_dict()
+
+    @staticmethod
+    def field_type(bamboohr_type: Optional[str]) -> typing.JSONTypeHelper:
+        """Converts the BambooHR type of a table field to the appropiate JSON type.
+
+        Defaults to string, as most values are returned as strings.
+        """
+        if bamboohr_type == "date":
+            return typing.DateType
+        if bamboohr_type == "currency":
+            return typing.ObjectType(
+                typing.Property("value", typing.StringType),
+                typing.Property("currency", typing.StringType),
+            )
+        return typing.StringType
+
+
+class TablesMetadata(TapBambooHRStream):
+    """Not synced: lists the employee tables and their fields.
+
+    Used during discovery to generate a `GenericEmployeeTable` per table.
+    """
+
+    name = "meta_tables"
+    path = "/meta/tables"
+    primary_keys = ["alias"]
+    replication_key = None
+
+    def __init__(self, tap: Tap) -> None:
+        super().__init__(tap=tap, schema={"type": "object", "properties": {}})
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        yield from response.json()
+
+
+class FieldsMetadata(TapBambooHRStream):
+    """Not synced: lists the fields of the account, with their types.
+
+    Used by custom reports to validate and type their fields, see the
+    `report_field_metadata` setting.
+    """
+
+    name = "meta_fields"
+    path = "/meta/fields"
+    primary_keys = ["id"]
+    replication_key = None
+
+    def __init__(self, tap: Tap) -> None:
+        super().__init__(tap=tap, schema={"type": "object", "properties": {}})
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        yield from response.json()
+
+
+class EmployeeChanges(TapBambooHRStream):
+    """Not synced: lists the employees changed since the `since` of the context.
+
+    Requested once per run by the tap's change feed, see
+    `TapBambooHR.employee_changes`.
+    """
+
+    name = "meta_employees_changed"
+    path = "/employees/changed"
+    primary_keys = ["id"]
+    replication_key = None
+
+    def __init__(self, tap: Tap) -> None:
+        super().__init__(tap=tap, schema={"type": "object", "properties": {}})
+
+    def get_url_params(
+        self, context: Optional[dict], next_page_token: Optional[Any]
+    ) -> Dict[str, Any]:
+        return {"since": (context or {}).get("since")}
+
+    def parse_response(self, response: requests.Response) -> Iterable[dict]:
+        yield from response.json().get("employees", {}).values()
+
+
+class EmploymentHistoryStatus(EmployeeTable):
+    name = "tables_employmentstatus"
+    path = "/employees/changed/tables/employmentStatus"
+    primary_keys = ["employee_id", "date", "employmentStatus"]
+    schema_filepath = SCHEMAS_DIR / "employmentstatus.json"
 
 
-# A more generic tables stream would be better, there is a table metadata api
 class EmployeeAssets(TapBambooHRStream):
     name = "tables_employeeassets"
     path = "/employees/all/tables/employeeAssets"
@@ -439,69 +2022,185 @@ class EmployeeAssets(TapBambooHRStream):
     schema_filepath = SCHEMAS_DIR / "employeeassets.json"
 
 
-class JobInfo(TapBambooHRStream):
+class JobInfo(EmployeeTable):
     name = "tables_jobinfo"
     path = "/employees/changed/tables/jobInfo"
     primary_keys = ["employee_id", "date", "location"]
-    replication_key = None
     schema_filepath = SCHEMAS_DIR / "jobinfo.json"
 
+
+class TimeOffStream(TapBambooHRStream):
+    """Not for direct use: should be subclassed.
+
+    Time off between two dates. With `time_off_window_months`, the dates are split
+    into windows requested separately, `time_off_concurrency` at a time, and with
+    `time_off_lookback_days` only the dates from shortly before the last run are
+    synced again. Progress through the windows is kept in the state, so an
+    interrupted incremental run resumes after the last completed window.
+    """
+
+    primary_keys = ["id"]
+    replication_key = None
+    supports_streaming = True
+    concurrency_setting = "time_off_concurrency"
+
     def get_url_params(
         self, context: Optional[dict], next_page_token: Optional[Any]
     ) -> Dict[str, Any]:
-        return {
-            "since": "2012-01-01T00:00:00Z"
-        }  # I want all of the data, 2012 is far enough back and referenced in the API Docs
+        return self.window_params(TIME_OFF_START, TIME_OFF_END)
+
+    def window_params(self, start: date, end: date) -> Dict[str, Any]:
+        return {"start": start.isoformat(), "end": end.isoformat()}
 
     def parse_response(self, response: requests.Response) -> Iterable[dict]:
-        """Parse the response and return an iterator of result rows.
+        if self.stream_response:
+            for item in iter_array_items(response):
+                yield self.standardize_data(item)
+        else:
+            yield from super().parse_response(response)
 
-        Args:
-            response: A raw `requests.Response`_ object.
+    @property
+    def window_months(self) -> Optional[int]:
+        return self.config.get("time_off_window_months")
 
-        Yields:
-            One item for every item found in the response.
+    @property
+    def lookback_days(self) -> Optional[int]:
+        return self.config.get("time_off_lookback_days")
 
-        .. _requests.Response:
-            https://docs.python-requests.org/en/latest/api/#requests.Response
+    def date_windows(self, start: date, today: date) -> t.List[t.Tuple[date, date]]:
+        """Split the dates from `start` on into `(start, end)` windows, inclusive.
+
+        Only dates between 2012 and a year from `today` are split into windows of
+        `time_off_window_months`, as earlier and later dates rarely hold much time
+        off. They are requested in one window each.
         """
-        for employeeid, value in response.json()["employees"].items():
-            last_changed = value["lastChanged"]
-            rows = value.get("rows", [])
-            for row in rows:
-                row.update({"lastChanged": last_changed})
-                row.update({"employee_id": employeeid})
-                row = self.standardize_data(row)
-                yield row
+        if not self.window_months:
+            return [(start, TIME_OFF_END)]
+        windows = []
+        window_start = max(start, TIME_OFF_WINDOWS_START)
+        if start < window_start:
+            windows.append((start, window_start - timedelta(days=1)))
+        horizon = today + timedelta(days=TIME_OFF_HORIZON_DAYS)
+        while window_start <= horizon:
+            window_end = add_months(window_start, self.window_months)
+            windows.append((window_start, window_end - timedelta(days=1)))
+            window_start = window_end
+        windows.append((window_start, TIME_OFF_END))
+        return windows
+
+    def request_window(self, start: date, end: date) -> t.List[dict]:
+        """Return the time off records between two dates, inclusive."""
+        prepared_request = self.build_prepared_request(
+            method=self.rest_method,
+            url=self.get_url(None),
+            params=self.window_params(start, end),
+            headers=self.http_headers,
+        )
+        decorated_request = self.request_decorator(self._request)
+        with metrics.http_request_counter(self.name, self.path) as request_counter:
+            response = decorated_request(prepared_request, None)
+            request_counter.increment()
+        self.update_sync_costs(prepared_request, response, None)
+        try:
+            return list(self.parse_timed(response, None))
+        finally:
+            response.close()
+
+    def fetch_windows(
+        self, windows: t.List[t.Tuple[date, date]]
+    ) -> t.Iterator[t.Tuple[t.Tuple[date, date], t.List[dict]]]:
+        """Yield each window with its records, in order.
+
+        Up to `time_off_concurrency` windows are requested ahead in the background.
+        """
+        concurrency = self.config.get("time_off_concurrency", 1)
+        pending: deque = deque()
+        try:
+            for window in windows:
+                future = self.executor.submit(self.request_window, *window)
+                pending.append((window, future))
+                if len(pending) >= concurrency:
+                    window, future = pending.popleft()
+                    yield window, future.result()
+            while pending:
+                window, future = pending.popleft()
+                yield window, future.result()
+        finally:
+            for _, future in pending:
+                future.cancel()
+
+    def sync_dates(self) -> t.Tuple[date, date]:
+        """Return the date to sync time off from, and the date of the run.
+
+        An interrupted incremental run is resumed with its own date.
+        """
+        today = datetime.now(timezone.utc).date()
+        state = self.stream_state
+        if not self.lookback_days:
+            return TIME_OFF_START, today
+        if "window_progress" in state:
+            progress = state["window_progress"]
+            start = date.fromisoformat(progress["synced_through"]) + timedelta(days=1)
+            self.logger.info(f"Resuming the sync of {self.name} from {start}")
+            return start, date.fromisoformat(progress["run_date"])
+        if "synced_through" in state:
+            bookmark = date.fromisoformat(state["synced_through"])
+            start = max(TIME_OFF_START, bookmark - timedelta(days=self.lookback_days))
+            return start, today
+        return TIME_OFF_START, today
+
+    def record_key(self, record: dict) -> t.Hashable:
+        """Return what identifies a record among the records of all windows."""
+        return record["id"]
 
+    def get_records(self, context: dict | None) -> t.Iterable[dict[str, t.Any]]:
+        """Return the records of each date window, in order.
+
+        Records overlapping several windows are only returned once, see
+        `record_key`.
+        """
+        state = self.stream_state
+        start, today = self.sync_dates()
+        windows = self.date_windows(start, today)
+        # Only overlapping windows return the same records twice
+        seen: t.Optional[t.Set[t.Hashable]] = set() if len(windows) > 1 else None
+        for (_, window_end), records in self.fetch_windows(windows):
+            for record in records:
+                if seen is not None:
+                    key = self.record_key(record)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                transformed_record = self.post_process(record, context)
+                if transformed_record is not None:
+                    yield transformed_record
+            if self.lookback_days:
+                state["window_progress"] = {
+                    "run_date": today.isoformat(),
+                    "synced_through": window_end.isoformat(),
+                }
+                self.write_progress()
+
+        if self.lookback_days:
+            state.pop("window_progress", None)
+            state["synced_through"] = today.isoformat()
+            self._is_state_flushed = False
 
-class WhosOut(TapBambooHRStream):
+
+class WhosOut(TimeOffStream):
     name = "whos_out"
     path = "/time_off/whos_out"
-    primary_keys = ["id"]
-    replication_key = None
     schema_filepath = SCHEMAS_DIR / "whos_out.json"
 
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        return {
-            "start": "1900-01-01",
-            "end": "2100-12-12"
-        }  # We want all of the data; these should be far enough in the future/past
+    def record_key(self, record: dict) -> t.Hashable:
+        """Return the type and id of a record.
+
+        Holidays and time off are numbered separately.
+        """
+        return record.get("type"), record["id"]
 
 
-class TimeOffRequests(TapBambooHRStream):
+class TimeOffRequests(TimeOffStream):
     name = "time_off_requests"
     path = "/time_off/requests"
-    primary_keys = ["id"]
-    replication_key = None
     schema_filepath = SCHEMAS_DIR / "time_off_requests.json"
-
-    def get_url_params(
-        self, context: Optional[dict], next_page_token: Optional[Any]
-    ) -> Dict[str, Any]:
-        return {
-            "start": "1900-01-01",
-            "end": "2100-12-12"
-        }  # We want all of the data; these should be far enough in the future/past
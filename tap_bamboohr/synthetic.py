@@ -0,0 +1,480 @@
+"""Synthetic BambooHR account served offline, for benchmarks and development."""
+from __future__ import annotations
+
+import io
+import itertools
+import json
+import re
+import typing as t
+from datetime import date, datetime, timedelta, timezone
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+
+from tap_bamboohr.images import PNG_SIGNATURE
+from tap_bamboohr.replay import build_response, request_target
+from tap_bamboohr.streams import canonical_field_name, get_field_types
+
+LIST_ALIASES = (
+    "jobTitle",
+    "location",
+    "division",
+    "department",
+    "employmentHistoryStatus",
+)
+OPTIONS_PER_LIST = 20
+TIME_OFF_PER_EMPLOYEE = 4
+# Holidays of each year, numbered from 1 like BambooHR does, apart from time off
+HOLIDAYS = (("01-01", "New Year's Day"), ("12-25", "Christmas Day"))
+HOLIDAY_YEARS = range(2015, 2027)
+PHOTO_SIZE = 16 * 1024
+# Fields of employee tables, as listed by /meta/tables: id, name, alias and type
+TableField = t.Dict[str, t.Any]
+TABLES: t.List[t.Dict[str, t.Any]] = [
+    {
+        "alias": "jobInfo",
+        "fields": [
+            {"id": 1, "name": "Date", "alias": "date", "type": "date"},
+            {"id": 2, "name": "Location", "alias": "location", "type": "list"},
+            {"id": 3, "name": "Department", "alias": "department", "type": "list"},
+            {"id": 4, "name": "Division", "alias": "division", "type": "list"},
+            {"id": 5, "name": "Job Title", "alias": "jobTitle", "type": "list"},
+            {"id": 6, "name": "Reports To", "alias": "reportsTo", "type": "employee"},
+        ],
+    },
+    {
+        "alias": "employmentStatus",
+        "fields": [
+            {"id": 7, "name": "Date", "alias": "date", "type": "date"},
+            {
+                "id": 8,
+                "name": "Employment Status",
+                "alias": "employmentStatus",
+                "type": "list",
+            },
+            {"id": 9, "name": "Comment", "alias": "comment", "type": "text"},
+        ],
+    },
+    {
+        "alias": "compensation",
+        "fields": [
+            {"id": 10, "name": "Start Date", "alias": "startDate", "type": "date"},
+            {"id": 11, "name": "Pay Rate", "alias": "rate", "type": "currency"},
+            {"id": 12, "name": "Pay Type", "alias": "type", "type": "list"},
+        ],
+    },
+]
+# Custom fields listed by /meta/fields, with ids from 4000 and these types in turn
+CUSTOM_FIELDS = 1000
+CUSTOM_FIELD_TYPES = ("text", "integer", "currency", "date")
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def field_types() -> t.Dict[str, str]:
+    """Return the types of the fields of the account, by canonical field name."""
+    types = dict(get_field_types())
+    for index in range(CUSTOM_FIELDS):
+        types[canonical_field_name(4000 + index)] = CUSTOM_FIELD_TYPES[
+            index % len(CUSTOM_FIELD_TYPES)
+        ]
+    return types
+
+
+class ChunkedReader(io.RawIOBase):
+    """Readable file object over an iterator of byte chunks.
+
+    Lets large bodies be generated as they are read, instead of all at once.
+    """
+
+    def __init__(self, chunks: t.Iterable[bytes]) -> None:
+        self._chunks = iter(chunks)
+        self._buffer = b""
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def readinto(self, buffer: t.Any) -> int:
+        while not self._buffer:
+            try:
+                self._buffer = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._buffer))
+        buffer[:size] = self._buffer[:size]
+        self._buffer = self._buffer[size:]
+        self._position += size
+        return size
+
+
+def json_chunks(
+    head: str, items: t.Iterable[t.Any], tail: str, batch: int = 100
+) -> t.Iterator[bytes]:
+    """Yield the JSON text of a document with a large array, a batch at a time.
+
+    Args:
+        head: Text before the array items, e.g. `'{"employees": ['`.
+        items: Items of the array.
+        tail: Text after the array items, e.g. `']}'`.
+        batch: Number of items per chunk.
+    """
+    yield head.encode("utf-8")
+    pieces: t.List[str] = []
+    first = True
+    for item in items:
+        pieces.append(json.dumps(item))
+        if len(pieces) == batch:
+            yield (("" if first else ",") + ",".join(pieces)).encode("utf-8")
+            pieces = []
+            first = False
+    if pieces:
+        yield (("" if first else ",") + ",".join(pieces)).encode("utf-8")
+    yield tail.encode("utf-8")
+
+
+class SyntheticAdapter(BaseAdapter):
+    """Transport adapter serving a generated account, without any network access.
+
+    The account has `employees` employees, each with a photo, a few time off
+    requests and a row in each of the employee tables. Custom reports answer with
+    values for whichever fields are requested, so the size of a report is set by
+    the `custom_reports` setting. All values are derived from the employee id, so
+    every run sees the same data.
+    """
+
+    def __init__(self, url_base: str, employees: int) -> None:
+        super().__init__()
+        self.url_base = url_base
+        self.employees = employees
+        self.routes: t.List[t.Tuple[str, re.Pattern, t.Callable]] = [
+            ("POST", re.compile(r"/reports/custom"), self.custom_report),
+            ("GET", re.compile(r"/meta/lists"), self.lists),
+            ("GET", re.compile(r"/meta/tables"), self.tables),
+            ("GET", re.compile(r"/meta/fields"), self.fields),
+            ("GET", re.compile(r"/employees/directory"), self.directory),
+            ("GET", re.compile(r"/employees/changed"), self.changed),
+            ("GET", re.compile(r"/employees/changed/tables/(\w+)"), self.table),
+            ("GET", re.compile(r"/employees/all/tables/(\w+)"), self.assets),
+            ("GET", re.compile(r"/employees/(\d+)/photo/\w+"), self.photo),
+            ("GET", re.compile(r"/applicant_tracking/locations"), self.locations),
+            ("GET", re.compile(r"/time_off/requests"), self.time_off_requests),
+            ("GET", re.compile(r"/time_off/whos_out"), self.whos_out),
+        ]
+
+    def send(  # type: ignore[override]
+        self, request: requests.PreparedRequest, **kwargs: t.Any
+    ) -> requests.Response:
+        target = urlsplit(request_target(request, self.url_base))
+        query = {key: values[-1] for key, values in parse_qs(target.query).items()}
+        for method, pattern, handler in self.routes:
+            match = pattern.fullmatch(target.path)
+            if match and request.method == method:
+                status_code, headers, body = handler(request, query, *match.groups())
+                break
+        else:
+            status_code, headers, body = 404, {}, b""
+        response = build_response(request, status_code, headers, b"")
+        if isinstance(body, bytes):
+            response.raw = io.BytesIO(body)
+        else:
+            response.raw = io.BufferedReader(ChunkedReader(body), 64 * 1024)
+        return response
+
+    def close(self) -> None:
+        pass
+
+    def employee_ids(self) -> t.Iterator[int]:
+        return iter(range(1, self.employees + 1))
+
+    @staticmethod
+    def last_changed(employee_id: int) -> datetime:
+        return EPOCH + timedelta(days=employee_id % 365, seconds=employee_id)
+
+    @staticmethod
+    def has_photo(employee_id: int) -> bool:
+        return employee_id % 5 != 0
+
+    @staticmethod
+    def field_value(field: str, field_type: t.Optional[str], employee_id: int) -> t.Any:
+        if field == "id":
+            return str(employee_id)
+        if field == "isPhotoUploaded":
+            return "true" if SyntheticAdapter.has_photo(employee_id) else "false"
+        if field == "lastChanged" or field_type == "timestamp":
+            return SyntheticAdapter.last_changed(employee_id).isoformat()
+        if field_type == "date":
+            return (date(1970, 1, 1) + timedelta(days=employee_id * 7)).isoformat()
+        if field_type == "bool":
+            return "true" if employee_id % 2 else "false"
+        if field_type == "integer":
+            return str(employee_id % 100)
+        if field_type == "currency":
+            return f"{employee_id * 1000}.00 USD"
+        if field_type == "list":
+            return f"{field} {employee_id % OPTIONS_PER_LIST}"
+        return f"{field} {employee_id}"
+
+    def custom_report(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        payload = json.loads(request.body or b"{}")
+        types = field_types()
+        fields = [
+            (field, types.get(canonical_field_name(field)))
+            for field in payload.get("fields", [])
+        ]
+        changed_since = payload.get("filters", {}).get("lastChanged", {}).get("value")
+        if changed_since:
+            since = datetime.fromisoformat(changed_since.replace("Z", "+00:00"))
+
+        def employees() -> t.Iterator[dict]:
+            for employee_id in self.employee_ids():
+                if changed_since and self.last_changed(employee_id) <= since:
+                    continue
+                row = {"id": str(employee_id)}
+                for field, field_type in fields:
+                    row[field] = self.field_value(field, field_type, employee_id)
+                yield row
+
+        report_fields = [
+            {"id": field, "type": field_type or "text", "name": field}
+            for field, field_type in fields
+        ]
+        head = json.dumps(
+            {"title": payload.get("title", "Report"), "fields": report_fields}
+        )
+        chunks = json_chunks(head[:-1] + ', "employees": [', employees(), "]}")
+        return 200, {"Content-Type": "application/json"}, chunks
+
+    def lists(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        body = [
+            {
+                "fieldId": index,
+                "alias": alias,
+                "manageable": "yes",
+                "multiple": "no",
+                "name": alias,
+                "options": [
+                    {
+                        "id": option,
+                        "archived": "no",
+                        "createdDate": None,
+                        "archivedDate": None,
+                        "name": f"{alias} {option}",
+                    }
+                    for option in range(OPTIONS_PER_LIST)
+                ],
+            }
+            for index, alias in enumerate(LIST_ALIASES)
+        ]
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def tables(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        return 200, {"Content-Type": "application/json"}, json.dumps(TABLES).encode()
+
+    def fields(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        # Known fields get ids from 1; their canonical names are their aliases
+        body = [
+            {"id": index, "name": name, "type": field_type, "alias": name}
+            for index, (name, field_type) in enumerate(get_field_types().items(), 1)
+            if name != "id"
+        ]
+        body.extend(
+            {
+                "id": 4000 + index,
+                "name": f"Custom Field {4000 + index}",
+                "type": CUSTOM_FIELD_TYPES[index % len(CUSTOM_FIELD_TYPES)],
+            }
+            for index in range(CUSTOM_FIELDS)
+        )
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def directory(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        def employees() -> t.Iterator[dict]:
+            for employee_id in self.employee_ids():
+                yield {
+                    "id": str(employee_id),
+                    "displayName": f"Employee {employee_id}",
+                    "firstName": "Employee",
+                    "lastName": str(employee_id),
+                    "jobTitle": f"jobTitle {employee_id % OPTIONS_PER_LIST}",
+                    "workEmail": f"employee{employee_id}@example.com",
+                    "department": f"department {employee_id % OPTIONS_PER_LIST}",
+                    "location": f"location {employee_id % OPTIONS_PER_LIST}",
+                    "division": f"division {employee_id % OPTIONS_PER_LIST}",
+                    "photoUploaded": self.has_photo(employee_id),
+                    "canUploadPhoto": True,
+                    "status": "Active",
+                }
+
+        chunks = json_chunks('{"fields": [], "employees": [', employees(), "]}")
+        return 200, {"Content-Type": "application/json"}, chunks
+
+    def changed(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        since = datetime.fromisoformat(
+            query.get("since", "2012-01-01T00:00:00Z").replace("Z", "+00:00")
+        )
+        employees = {}
+        for employee_id in self.employee_ids():
+            last_changed = self.last_changed(employee_id)
+            if last_changed > since:
+                employees[str(employee_id)] = {
+                    "id": str(employee_id),
+                    "action": "Updated",
+                    "lastChanged": last_changed.isoformat(),
+                }
+        body = {
+            "latest": datetime.now(timezone.utc).isoformat(),
+            "employees": employees,
+        }
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def table(
+        self, request: requests.PreparedRequest, query: dict, alias: str
+    ) -> tuple:
+        fields: t.Optional[t.List[TableField]] = next(
+            (table["fields"] for table in TABLES if table["alias"] == alias), None
+        )
+        if fields is None:
+            return 404, {}, b""
+        since = datetime.fromisoformat(
+            query.get("since", "2012-01-01T00:00:00Z").replace("Z", "+00:00")
+        )
+        chunks = []
+        for employee_id in self.employee_ids():
+            last_changed = self.last_changed(employee_id)
+            if last_changed <= since:
+                continue
+            row = {}
+            for field in fields:
+                if field["type"] == "currency":
+                    row[field["alias"]] = {"value": "1000.00", "currency": "USD"}
+                else:
+                    row[field["alias"]] = self.field_value(
+                        field["alias"], field["type"], employee_id
+                    )
+            value = {"lastChanged": last_changed.isoformat(), "rows": [row]}
+            chunks.append(f'"{employee_id}": {json.dumps(value)}')
+        body = f'{{"table": "{alias}", "employees": {{{", ".join(chunks)}}}}}'
+        return 200, {"Content-Type": "application/json"}, body.encode()
+
+    def assets(
+        self, request: requests.PreparedRequest, query: dict, alias: str
+    ) -> tuple:
+        rows = (
+            {
+                "id": str(employee_id),
+                "employeeId": str(employee_id),
+                "category": "Laptop",
+                "description": f"Laptop {employee_id}",
+                "serialNumber": f"SN{employee_id}",
+                "dateLoaned": "2020-01-01",
+                "dateReturned": None,
+                "cost": {"value": "1000.00", "currency": "USD"},
+                "notes": None,
+            }
+            for employee_id in self.employee_ids()
+            if employee_id % 3 == 0
+        )
+        return 200, {"Content-Type": "application/json"}, json_chunks("[", rows, "]")
+
+    def photo(
+        self, request: requests.PreparedRequest, query: dict, employee_id: str
+    ) -> tuple:
+        number = int(employee_id)
+        if not 0 < number <= self.employees or not self.has_photo(number):
+            return 404, {}, b""
+        etag = f'"{number}"'
+        if request.headers.get("If-None-Match") == etag:
+            return 304, {"ETag": etag}, b""
+        header = (
+            PNG_SIGNATURE
+            + (13).to_bytes(4, "big")
+            + b"IHDR"
+            + (150).to_bytes(4, "big")
+            + (150).to_bytes(4, "big")
+        )
+        filler = number.to_bytes(4, "big") * ((PHOTO_SIZE - len(header)) // 4)
+        return 200, {"Content-Type": "image/png", "ETag": etag}, header + filler
+
+    def locations(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        body = [
+            {"id": str(index), "name": f"location {index}", "city": "Utah"}
+            for index in range(OPTIONS_PER_LIST)
+        ]
+        return 200, {"Content-Type": "application/json"}, json.dumps(body).encode()
+
+    def time_off(self, query: dict) -> t.Iterator[t.Tuple[int, int, date, date]]:
+        """Yield `(id, employee id, start, end)` of the time off between two dates."""
+        start = date.fromisoformat(query.get("start", "1900-01-01"))
+        end = date.fromisoformat(query.get("end", "2100-12-12"))
+        for employee_id in self.employee_ids():
+            for index in range(TIME_OFF_PER_EMPLOYEE):
+                days = (employee_id * 37 + index * 97) % 4000
+                time_off_start = date(2015, 1, 1) + timedelta(days=days)
+                time_off_end = time_off_start + timedelta(days=index % 5)
+                if time_off_start <= end and time_off_end >= start:
+                    time_off_id = employee_id * TIME_OFF_PER_EMPLOYEE + index
+                    yield time_off_id, employee_id, time_off_start, time_off_end
+
+    def time_off_requests(
+        self, request: requests.PreparedRequest, query: dict
+    ) -> tuple:
+        rows = (
+            {
+                "id": str(time_off_id),
+                "employeeId": str(employee_id),
+                "status": {
+                    "lastChanged": (start - timedelta(days=10)).isoformat(),
+                    "lastChangedByUserId": "1",
+                    "status": "approved",
+                },
+                "name": f"Employee {employee_id}",
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+                "created": (start - timedelta(days=10)).isoformat(),
+                "type": {"id": "1", "name": "Vacation", "icon": "palm-trees"},
+                "amount": {"unit": "days", "amount": str((end - start).days + 1)},
+                "actions": {"view": True, "edit": False, "cancel": False},
+                "dates": {start.isoformat(): "1"},
+                "notes": {},
+            }
+            for time_off_id, employee_id, start, end in self.time_off(query)
+        )
+        return 200, {"Content-Type": "application/json"}, json_chunks("[", rows, "]")
+
+    @staticmethod
+    def holidays(query: dict) -> t.Iterator[dict]:
+        """Yield the holidays between two dates, as listed by whos_out."""
+        start = date.fromisoformat(query.get("start", "1900-01-01"))
+        end = date.fromisoformat(query.get("end", "2100-12-12"))
+        holiday_id = 0
+        for year in HOLIDAY_YEARS:
+            for day, name in HOLIDAYS:
+                holiday_id += 1
+                holiday = date.fromisoformat(f"{year}-{day}")
+                if start <= holiday <= end:
+                    yield {
+                        "id": holiday_id,
+                        "type": "holiday",
+                        "name": name,
+                        "start": holiday.isoformat(),
+                        "end": holiday.isoformat(),
+                    }
+
+    def whos_out(self, request: requests.PreparedRequest, query: dict) -> tuple:
+        time_off = (
+            {
+                "id": time_off_id,
+                "type": "timeOff",
+                "employeeId": employee_id,
+                "name": f"Employee {employee_id}",
+                "start": start.isoformat(),
+                "end": end.isoformat(),
+            }
+            for time_off_id, employee_id, start, end in self.time_off(query)
+        )
+        rows = itertools.chain(time_off, self.holidays(query))
+        return 200, {"Content-Type": "application/json"}, json_chunks("[", rows, "]")
@@ -1,13 +1,32 @@
 """BambooHR tap class."""
 
-import datetime
-from typing import List
+import copy
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import cached_property
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
+import requests
+from requests.adapters import BaseAdapter, HTTPAdapter
 from singer_sdk import Stream, Tap
 from singer_sdk import typing as th
+from singer_sdk._singerlib import StateMessage, write_message
 
+from tap_bamboohr.discovery import DiscoveryCache
+from tap_bamboohr.instrumentation import profiled
+from tap_bamboohr.output import BatchedWriter, LockedWriter
+from tap_bamboohr.ratelimit import RateLimiter
+from tap_bamboohr.snapshot import SnapshotIndex
 from tap_bamboohr.streams import (
+    API_URL_BASE,
+    CHANGE_FEED_OVERLAP,
     CustomReport,
+    EmployeeChanges,
+    FieldsMetadata,
     Photos,
     PhotosUsers,
     Employees,
@@ -19,13 +38,27 @@ from tap_bamboohr.streams import (
     Departments,
     EmploymentStatuses,
     EmployeeAssets,
+    GenericEmployeeTable,
     LocationsDetail,
+    TablesMetadata,
+    TapBambooHRStream,
     WhosOut,
     TimeOffRequests,
+    format_timestamp,
+    index_field_metadata,
 )
 
 PLUGIN_NAME = "tap-bamboohr"
 
+# Settings determining which account answers requests, keying the discovery cache
+# and the snapshot indexes
+ACCOUNT_SETTINGS = (
+    "subdomain",
+    "synthetic_employees",
+    "http_cassette_dir",
+    "http_cassette_mode",
+)
+
 STREAM_TYPES = [  # CustomReport has special handing below
     Photos,
     PhotosUsers,
@@ -72,6 +105,17 @@ class TapBambooHR(Tap):
                 "by API don't match fields specified in tap config."
             ),
         ),
+        th.Property(
+            "report_field_metadata",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Request the fields of the account from /meta/fields to check the "
+                "fields of custom reports before requesting them, and to output "
+                "integers, numbers and currencies with precise types."
+            ),
+        ),
         th.Property(
             "photo_size",
             th.StringType,
@@ -83,11 +127,409 @@ class TapBambooHR(Tap):
                 "information can be found in the [docs](https://documentation.bamboohr.com/reference/get-employee-photo-1)"
             ),
         ),
+        th.Property(
+            "photo_concurrency",
+            th.IntegerType,
+            required=False,
+            default=1,
+            description=(
+                "Number of employee photos to download in parallel in the photos "
+                "stream. Records are still emitted in order."
+            ),
+        ),
+        th.Property(
+            "photo_cache_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory in which to cache employee photos between runs, e.g. on a "
+                "mounted volume. Cached photos are revalidated with conditional "
+                "requests instead of being downloaded again. Disabled when not set."
+            ),
+        ),
+        th.Property(
+            "photo_cache_max_bytes",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Maximum size of the photo cache in bytes. The least recently used "
+                "photos are evicted first. Unlimited when not set."
+            ),
+        ),
+        th.Property(
+            "photo_cache_max_age_days",
+            th.NumberType,
+            required=False,
+            description=(
+                "Evict cached photos not revalidated within this many days. "
+                "Unlimited when not set."
+            ),
+        ),
+        th.Property(
+            "photo_changed_only",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Only emit photos that changed since the last run, tracked in the "
+                "Singer state."
+            ),
+        ),
+        th.Property(
+            "photo_skip_unchanged",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Only request the photos of employees whose `lastChanged` or "
+                "`isPhotoUploaded` changed since the last run, tracked in the "
+                "Singer state."
+            ),
+        ),
+        th.Property(
+            "employee_change_feed",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Request the employees changed since the last run once per run, and "
+                "only request the photos of changed employees. Incremental employee "
+                "tables and custom reports skip their requests when no employee "
+                "changed."
+            ),
+        ),
+        th.Property(
+            "snapshot_diff_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory in which to keep an index of the records emitted by the "
+                "employees, photos_users and full table custom report streams, so "
+                "that only records inserted or changed since the last run are "
+                "emitted. Disabled when not set."
+            ),
+        ),
+        th.Property(
+            "snapshot_diff_deletes",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "With `snapshot_diff_dir`, also emit a record with the primary key "
+                "and `_sdc_deleted_at` of each record no longer returned by the API."
+            ),
+        ),
+        th.Property(
+            "photo_output",
+            th.StringType,
+            allowed_values=["base64", "hash", "file"],
+            required=False,
+            default="base64",
+            description=(
+                "How the photos stream outputs photo bytes: `base64` inlines them in "
+                "the `photo` property, `hash` only outputs their SHA-256, size and "
+                "dimensions, and `file` writes them to `photo_output_dir` and "
+                "outputs their path."
+            ),
+        ),
+        th.Property(
+            "photo_output_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory photos are written to, named after their SHA-256, when "
+                "`photo_output` is `file`."
+            ),
+        ),
+        th.Property(
+            "time_off_window_months",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Split the dates requested by the time_off_requests and whos_out "
+                "streams into windows of this many months, from 2012 until a year "
+                "from now. All dates are requested at once when not set."
+            ),
+        ),
+        th.Property(
+            "time_off_concurrency",
+            th.IntegerType,
+            required=False,
+            default=1,
+            description=(
+                "Number of time off date windows to request in parallel. Records are "
+                "still emitted in order."
+            ),
+        ),
+        th.Property(
+            "time_off_lookback_days",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Sync time off incrementally, from this many days before the last "
+                "run. Progress through the date windows is tracked in the Singer "
+                "state, so an interrupted run resumes where it stopped. All time off "
+                "is synced on every run when not set."
+            ),
+        ),
+        th.Property(
+            "custom_report_concurrency",
+            th.IntegerType,
+            required=False,
+            default=1,
+            description=(
+                "Number of requests of a custom report split with "
+                "`fields_per_request` to send in parallel."
+            ),
+        ),
+        th.Property(
+            "max_requests_per_second",
+            th.NumberType,
+            required=False,
+            description=(
+                "Maximum number of requests per second sent to BambooHR across all "
+                "streams. Unlimited when not set. The rate is lowered automatically "
+                "when BambooHR throttles requests, honouring Retry-After."
+            ),
+        ),
+        th.Property(
+            "parallel_streams",
+            th.IntegerType,
+            required=False,
+            default=1,
+            description=(
+                "Number of top-level streams to sync concurrently. Messages of each "
+                "stream stay in order, and state is written as each stream finishes."
+            ),
+        ),
+        th.Property(
+            "child_checkpoint_interval",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Save the progress of streams with child streams, such as the "
+                "photos of photos_users, to the state every this many records, so "
+                "that an interrupted run resumes from the last checkpoint. Progress "
+                "is only saved once each stream finishes when not set."
+            ),
+        ),
+        th.Property(
+            "stream_responses",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Stream and incrementally parse the responses of custom reports and "
+                "employee tables instead of loading them into memory at once. "
+                "Keeps memory use flat for large tenants."
+            ),
+        ),
+        th.Property(
+            "fast_output",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Serialize records with a faster encoder and write messages to "
+                "stdout in large batches instead of flushing each one. The output "
+                "is the same, but arrives downstream in bursts. Not used for "
+                "streams with stream maps or flattening."
+            ),
+        ),
+        th.Property(
+            "discovery_cache_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory in which to cache the account metadata requested during "
+                "discovery between runs, such as the employee table metadata. "
+                "Disabled when not set."
+            ),
+        ),
+        th.Property(
+            "discovery_cache_max_age_hours",
+            th.NumberType,
+            required=False,
+            default=24,
+            description=(
+                "Request cached account metadata again once it is older than this "
+                "many hours."
+            ),
+        ),
+        th.Property(
+            "employee_tables",
+            th.ArrayType(th.StringType),
+            required=False,
+            description=(
+                "Aliases of employee tables (e.g. `compensation`, "
+                "`emergencyContacts`) to sync as `tables_<alias>` streams, with "
+                "schemas generated from the table metadata API."
+            ),
+        ),
+        th.Property(
+            "http_cassette_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory of recorded API responses, used with "
+                "`http_cassette_mode`."
+            ),
+        ),
+        th.Property(
+            "http_cassette_mode",
+            th.StringType,
+            allowed_values=["record", "replay"],
+            required=False,
+            default="record",
+            description=(
+                "`record` saves every API response to `http_cassette_dir`, and "
+                "`replay` answers requests from the saved responses without "
+                "network access."
+            ),
+        ),
+        th.Property(
+            "http_cassette_scrub",
+            th.BooleanType,
+            required=False,
+            default=True,
+            description=(
+                "Replace the names, emails, dates, amounts and photos of employees "
+                "in recorded responses, keeping ids and the shape of values. When "
+                "disabled, responses are recorded as they are and hold personal "
+                "data."
+            ),
+        ),
+        th.Property(
+            "synthetic_employees",
+            th.IntegerType,
+            required=False,
+            description=(
+                "Sync a generated account with this many employees instead of "
+                "BambooHR, without network access. Meant for benchmarks and "
+                "development."
+            ),
+        ),
+        th.Property(
+            "profile",
+            th.StringType,
+            allowed_values=["cprofile", "pyinstrument"],
+            required=False,
+            description=(
+                "Profile the sync of each top-level stream, along with its child "
+                "streams, and write the profiles to `profile_dir`. `pyinstrument` "
+                "requires the `profile` extra, e.g. "
+                "`pip install tap-bamboohr[profile]`. Disabled when not set."
+            ),
+        ),
+        th.Property(
+            "profile_dir",
+            th.StringType,
+            required=False,
+            description=(
+                "Directory profiles are written to, named after their stream. "
+                "Defaults to the working directory."
+            ),
+        ),
+        th.Property(
+            "record_timings",
+            th.BooleanType,
+            required=False,
+            default=False,
+            description=(
+                "Also time standardizing and writing each record in the sync "
+                "timings logged for each stream. Adds a little time to every record."
+            ),
+        ),
+        th.Property(
+            "batch_config",
+            th.ObjectType(
+                th.Property(
+                    "encoding",
+                    th.ObjectType(
+                        th.Property(
+                            "format",
+                            th.StringType,
+                            allowed_values=["jsonl", "parquet"],
+                            description=(
+                                "Format of batch files. `parquet` writes typed "
+                                "columns and requires the `parquet` extra."
+                            ),
+                        ),
+                        th.Property(
+                            "compression",
+                            th.StringType,
+                            allowed_values=[
+                                "gzip",
+                                "none",
+                                "snappy",
+                                "zstd",
+                                "lz4",
+                                "brotli",
+                            ],
+                            description=(
+                                "Compression of batch files. `jsonl` files support "
+                                "`gzip` and `none`, and `parquet` files default to "
+                                "`snappy`."
+                            ),
+                        ),
+                    ),
+                    description="Format and compression of batch files.",
+                ),
+                th.Property(
+                    "storage",
+                    th.ObjectType(
+                        th.Property(
+                            "root",
+                            th.StringType,
+                            description=(
+                                "URL of the directory batch files are written to, "
+                                "e.g. `file:///tmp/batches`."
+                            ),
+                        ),
+                        th.Property(
+                            "prefix",
+                            th.StringType,
+                            description="Prefix of the names of batch files.",
+                        ),
+                    ),
+                    description="Where batch files are written.",
+                ),
+                th.Property(
+                    "batch_size",
+                    th.IntegerType,
+                    description="Number of records in each batch file.",
+                ),
+            ),
+            required=False,
+            description=(
+                "Write the records of each stream to batch files, referenced by "
+                "BATCH messages, instead of RECORD messages."
+            ),
+        ),
         th.Property(
             "custom_reports",
             th.ArrayType(
                 th.ObjectType(
                     th.Property("name", th.StringType),
+                    th.Property(
+                        "incremental",
+                        th.BooleanType,
+                        default=False,
+                        description=(
+                            "Sync the report incrementally: `lastChanged` is added to "
+                            "the fields and the `lastChanged` filter is set from the "
+                            "bookmark of the previous run."
+                        ),
+                    ),
+                    th.Property(
+                        "fields_per_request",
+                        th.IntegerType,
+                        description=(
+                            "Split the report into requests of at most this many "
+                            "fields, joined back on `id`. Each request is retried on "
+                            "its own. All fields are requested at once when not set."
+                        ),
+                    ),
                     # Filters are optional.
                     # Docs: https://documentation.bamboohr.com/reference/request-custom-report-1
                     th.Property(
@@ -150,9 +592,301 @@ class TapBambooHR(Tap):
         ),
     ).to_dict()
 
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self._shared: Dict[str, Any] = {}
+        self._shared_locks: Dict[str, threading.Lock] = {}
+        self._shared_lock = threading.Lock()
+        self.syncing_in_parallel = False
+        self.written_state: dict = {}
+        self.written_state_lock = threading.Lock()
+        self.sync_seconds: Dict[str, float] = {}
+        super().__init__(*args, **kwargs)
+
+    def get_shared(self, key: str, fetch: Callable[[], Any]) -> Any:
+        """Return the result of `fetch`, computed only once per run for each key.
+
+        Lets streams backed by the same response share a single request.
+        """
+        with self._shared_lock:
+            lock = self._shared_locks.setdefault(key, threading.Lock())
+        with lock:
+            if key not in self._shared:
+                self._shared[key] = fetch()
+        return self._shared[key]
+
+    @cached_property
+    def discovery_cache(self) -> Optional[DiscoveryCache]:
+        """Return the cache of account metadata, if `discovery_cache_dir` is set."""
+        directory = self.config.get("discovery_cache_dir")
+        if not directory:
+            return None
+        max_age_hours = self.config.get("discovery_cache_max_age_hours", 24)
+        return DiscoveryCache(
+            directory,
+            key={setting: self.config.get(setting) for setting in ACCOUNT_SETTINGS},
+            max_age=None if max_age_hours is None else max_age_hours * 3600,
+        )
+
+    def get_metadata(self, path: str, fetch: Callable[[], Any]) -> Any:
+        """Return the account metadata at `path`, as returned by `fetch`.
+
+        Requested at most once per run, and kept between runs in the discovery
+        cache when it is enabled.
+        """
+        cache = self.discovery_cache
+        if cache is None:
+            return self.get_shared(path, fetch)
+        return self.get_shared(path, lambda: cache.get(path, fetch))
+
+    def snapshot_index(self, stream_name: str) -> SnapshotIndex:
+        """Open the index of the records last emitted by a stream.
+
+        Indexes are kept in `snapshot_diff_dir`, one per account and stream.
+        """
+        return SnapshotIndex(
+            self.config["snapshot_diff_dir"],
+            key={
+                **{setting: self.config.get(setting) for setting in ACCOUNT_SETTINGS},
+                "stream": stream_name,
+            },
+        )
+
+    def field_metadata(self) -> Dict[str, dict]:
+        """Return the fields listed by /meta/fields, by canonical id and alias.
+
+        Requested at most once per run, see `get_metadata`.
+        """
+        return index_field_metadata(
+            self.get_metadata(
+                "/meta/fields",
+                lambda: list(FieldsMetadata(tap=self).request_records(None)),
+            )
+        )
+
+    def employee_changes(self, since: datetime) -> Optional[Dict[str, datetime]]:
+        """Return when employees changed after `since`, by id.
+
+        The changes are requested from /employees/changed once per run, from the
+        earliest time a synced stream needs them from, see
+        `TapBambooHRStream.change_feed_since`. Returns None if they were requested
+        from later than `since`.
+        """
+        feed_since, changes = self.get_shared(
+            "/employees/changed", self.request_employee_changes
+        )
+        if feed_since is None or since < feed_since:
+            return None
+        return {
+            employee_id: changed
+            for employee_id, changed in changes.items()
+            if changed > since
+        }
+
+    def request_employee_changes(
+        self,
+    ) -> Tuple[Optional[datetime], Dict[str, datetime]]:
+        """Request the employees changed since any synced stream last synced.
+
+        Returns the time changes were requested from, or None if no stream needs
+        them, and when each changed employee changed, by id.
+        """
+        since_values = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                continue
+            if isinstance(stream, TapBambooHRStream):
+                since = stream.change_feed_since
+                if since is not None:
+                    since_values.append(since)
+        if not since_values:
+            return None, {}
+        feed_since = min(since_values) - CHANGE_FEED_OVERLAP
+        changes = {
+            record["id"]: datetime.fromisoformat(
+                record["lastChanged"].replace("Z", "+00:00")
+            )
+            for record in EmployeeChanges(tap=self).request_records(
+                {"since": format_timestamp(feed_since)}
+            )
+        }
+        self.logger.info(
+            f"{len(changes)} employees changed since {feed_since.isoformat()}"
+        )
+        return feed_since, changes
+
+    @cached_property
+    def rate_limiter(self) -> RateLimiter:
+        """Return the rate limiter shared by all streams of this tap."""
+        return RateLimiter(self.config.get("max_requests_per_second"))
+
+    # `Tap.sync_all` is final, and the SDK has no hook around its loop over the
+    # streams, which `sync_streams` replaces to sync them in parallel. The override is
+    # safe as long as `sync_streams` does what the SDK's loop does, which is why
+    # singer-sdk is pinned to the exact version it mirrors (0.29.0): check it against
+    # `Tap.sync_all` when upgrading.
+    def sync_all(self) -> None:  # type: ignore[misc]
+        """Sync all streams, writing messages in batches if `fast_output` is set."""
+        if not self.config.get("fast_output"):
+            self.sync_streams()
+            return
+        stdout = sys.stdout
+        writer = BatchedWriter(stdout)
+        sys.stdout = writer  # type: ignore[assignment]
+        try:
+            self.sync_streams()
+        finally:
+            sys.stdout = stdout
+            writer.drain()
+
+    def sync_streams(self) -> None:
+        """Sync all streams, concurrently if `parallel_streams` is above 1.
+
+        Mirrors the loop of singer-sdk 0.29.0's `Tap.sync_all`, see `sync_all`.
+        """
+        workers = self.config.get("parallel_streams", 1)
+        self._reset_state_progress_markers()
+        self._set_compatible_replication_methods()
+        write_message(StateMessage(value=self.state))
+        if workers > 1:
+            self.sync_in_parallel(self.top_level_streams(), workers)
+        else:
+            for stream in self.top_level_streams():
+                self.sync_stream(stream)
+                stream.finalize_state_progress_markers()
+                stream._write_state_message()
+        # Child streams are only synced by their parent, but log their costs too
+        for stream in self.streams.values():
+            stream.log_sync_costs()
+
+    def sync_stream(self, stream: Stream) -> None:
+        """Sync a top-level stream and its children, profiled if `profile` is set.
+
+        The wall time of the sync is kept in `sync_seconds`, and the executors of
+        the streams are shut down once it ends.
+        """
+        profile_dir = Path(self.config.get("profile_dir") or ".")
+        start = time.perf_counter()
+        try:
+            with profiled(self.config.get("profile"), profile_dir / stream.name):
+                stream.sync()
+        finally:
+            self.sync_seconds[stream.name] = time.perf_counter() - start
+            for synced in [stream, *stream.descendent_streams]:
+                if isinstance(synced, TapBambooHRStream):
+                    synced.shutdown_executor()
+
+    def top_level_streams(self) -> List[Stream]:
+        """Return the selected streams not synced by a parent stream."""
+        streams = []
+        for stream in self.streams.values():
+            if not stream.selected and not stream.has_selected_descendents:
+                self.logger.info("Skipping deselected stream '%s'.", stream.name)
+            elif not stream.parent_stream_type:
+                # Child streams are synced by their parent
+                streams.append(stream)
+        return streams
+
+    def sync_in_parallel(self, streams: List[Stream], workers: int) -> None:
+        """Sync `streams` in `workers` threads, writing state as each one finishes."""
+        # Streams change their own bookmarks while they sync, so each finished
+        # stream's bookmarks are copied into a separate state that is safe to write.
+        self.written_state = copy.deepcopy(self.state)
+
+        def sync_stream(stream: Stream) -> None:
+            self.sync_stream(stream)
+            stream.finalize_state_progress_markers()
+            self.write_stream_state(stream)
+
+        # Create the shared session and rate limiter before any worker thread does
+        self.requests_session
+        self.rate_limiter
+
+        stdout = sys.stdout
+        sys.stdout = LockedWriter(stdout)  # type: ignore[assignment]
+        self.syncing_in_parallel = True
+        try:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix=self.name
+            ) as executor:
+                futures = [executor.submit(sync_stream, stream) for stream in streams]
+                try:
+                    for future in futures:
+                        future.result()
+                except BaseException:
+                    for future in futures:
+                        future.cancel()
+                    raise
+        finally:
+            self.syncing_in_parallel = False
+            sys.stdout = stdout
+
+    def write_stream_state(self, stream: Stream) -> None:
+        """Write a STATE message with the bookmarks of `stream` as they are now.
+
+        Used while streams are synced in parallel: the bookmarks of `stream` and its
+        descendants are copied into the state written by the tap, so that streams
+        still syncing only write their bookmarks themselves. Only to be called from
+        the thread syncing `stream`.
+        """
+        bookmarks = self.state.get("bookmarks", {})
+        with self.written_state_lock:
+            for synced in [stream, *stream.descendent_streams]:
+                if synced.name in bookmarks:
+                    self.written_state.setdefault("bookmarks", {})[
+                        synced.name
+                    ] = copy.deepcopy(bookmarks[synced.name])
+            write_message(StateMessage(value=self.written_state))
+
+    @cached_property
+    def requests_session(self) -> requests.Session:
+        """Return the keep-alive session shared by all streams of this tap.
+
+        The connection pool is sized for the configured concurrency. Requests are
+        recorded, replayed or answered by a synthetic account instead when
+        configured to.
+        """
+        pool_size = max(
+            10,
+            self.config.get("parallel_streams", 1)
+            + self.config.get("photo_concurrency", 1)
+            + self.config.get("time_off_concurrency", 1)
+            + self.config.get("custom_report_concurrency", 1),
+        )
+        url_base = API_URL_BASE.format(subdomain=self.config.get("subdomain"))
+        cassette_dir = self.config.get("http_cassette_dir")
+        adapter: BaseAdapter
+        # Offline adapters are only imported when used, to keep startup short
+        if self.config.get("synthetic_employees"):
+            from tap_bamboohr.synthetic import SyntheticAdapter
+
+            adapter = SyntheticAdapter(url_base, self.config["synthetic_employees"])
+        elif cassette_dir and self.config.get("http_cassette_mode") == "replay":
+            from tap_bamboohr.replay import ReplayAdapter
+
+            adapter = ReplayAdapter(cassette_dir, url_base)
+        elif cassette_dir:
+            from tap_bamboohr.replay import RecordingAdapter
+
+            adapter = RecordingAdapter(
+                cassette_dir,
+                url_base,
+                scrub=self.config.get("http_cassette_scrub", True),
+                pool_connections=1,
+                pool_maxsize=pool_size,
+            )
+        else:
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        session = requests.Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
+
     def discover_streams(self) -> List[Stream]:
         """Return a list of discovered streams."""
-        streams = [stream_class(tap=self) for stream_class in STREAM_TYPES]
+        streams: List[Stream] = [
+            stream_class(tap=self) for stream_class in STREAM_TYPES
+        ]
+        streams.extend(self.discover_employee_tables(streams))
         for report_number, report in enumerate(self.config.get("custom_reports", [])):
             streams.append(
                 CustomReport(
@@ -163,6 +897,34 @@ class TapBambooHR(Tap):
             )
         return streams
 
+    def discover_employee_tables(self, streams: List[Stream]) -> List[Stream]:
+        """Return a stream for each table in `employee_tables`.
+
+        Tables already covered by a hand-written stream are skipped.
+        """
+        aliases = self.config.get("employee_tables")
+        if not aliases:
+            return []
+        stream_names = {stream.name for stream in streams}
+        tables = {
+            table["alias"]: table
+            for table in self.get_metadata(
+                "/meta/tables",
+                lambda: list(TablesMetadata(tap=self).request_records(None)),
+            )
+        }
+        table_streams: List[Stream] = []
+        for alias in aliases:
+            if alias not in tables:
+                raise ValueError(
+                    f"Employee table `{alias}` was not found. Available tables are: "
+                    f"{', '.join(sorted(tables))}."
+                )
+            stream = GenericEmployeeTable(tap=self, table=tables[alias])
+            if stream.name not in stream_names:
+                table_streams.append(stream)
+        return table_streams
+
 
 # CLI Execution:
 
@@ -0,0 +1,32 @@
+"""Fixtures of the test suite."""
+from __future__ import annotations
+
+import pytest
+from requests.adapters import HTTPAdapter
+from urllib3.response import HTTPResponse
+
+from tap_bamboohr.streams import API_URL_BASE
+from tap_bamboohr.synthetic import SyntheticAdapter
+from tap_bamboohr.tests.helpers import base_config
+
+
+@pytest.fixture
+def synthetic_account(monkeypatch):
+    """Answer the requests sent over the network from a synthetic account."""
+    config = base_config(20)
+    account = SyntheticAdapter(
+        API_URL_BASE.format(subdomain=config["subdomain"]),
+        config["synthetic_employees"],
+    )
+
+    def send(self, request, **kwargs):
+        response = account.send(request, **kwargs)
+        response.raw = HTTPResponse(
+            body=response.raw,
+            headers=dict(response.headers),
+            status=response.status_code,
+            preload_content=False,
+        )
+        return response
+
+    monkeypatch.setattr(HTTPAdapter, "send", send)
@@ -0,0 +1,92 @@
+"""Helpers syncing the tap against a synthetic account, without network access."""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import typing as t
+from pathlib import Path
+
+from tap_bamboohr.tap import TapBambooHR
+
+
+def base_config(employees: int = 20, **settings: t.Any) -> dict:
+    """Return the config of a tap syncing a synthetic account."""
+    return {
+        "auth_token": "token",
+        "subdomain": "example",
+        "synthetic_employees": employees,
+        **settings,
+    }
+
+
+def cassette_config(directory: Path, **settings: t.Any) -> dict:
+    """Return the config of a tap recording or replaying responses in `directory`."""
+    config = base_config(http_cassette_dir=str(directory), **settings)
+    del config["synthetic_employees"]
+    return config
+
+
+def build_tap(
+    config: dict,
+    streams: t.Optional[t.Iterable[str]] = None,
+    state: t.Optional[dict] = None,
+    key_properties: t.Optional[t.Dict[str, t.List[str]]] = None,
+) -> TapBambooHR:
+    """Return a tap with `config` and `state`.
+
+    Only `streams` are selected, along with their children, when given, and the
+    key properties of the catalog are overridden by `key_properties`.
+    """
+    catalog = None
+    if streams is not None or key_properties:
+        catalog = TapBambooHR(config=config, parse_env_config=False).catalog_dict
+        for entry in catalog["streams"]:
+            name = entry["tap_stream_id"]
+            if key_properties and name in key_properties:
+                entry["key_properties"] = key_properties[name]
+            if streams is None:
+                continue
+            for metadata in entry["metadata"]:
+                if metadata["breadcrumb"] == []:
+                    metadata["metadata"]["selected"] = name in streams
+    return TapBambooHR(
+        config=config, catalog=catalog, state=state, parse_env_config=False
+    )
+
+
+def sync_output(tap: TapBambooHR) -> str:
+    """Sync `tap` and return what it wrote to stdout."""
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        tap.sync_all()
+    return output.getvalue()
+
+
+def parse_messages(output: str) -> t.List[dict]:
+    """Return the messages of the output of a sync."""
+    return [json.loads(line) for line in output.splitlines()]
+
+
+def sync(config: dict, **kwargs: t.Any) -> t.List[dict]:
+    """Sync a tap built with `build_tap` and return the messages it wrote."""
+    return parse_messages(sync_output(build_tap(config, **kwargs)))
+
+
+def records(messages: t.Iterable[dict], stream: str) -> t.List[dict]:
+    """Return the records of a stream written to `messages`."""
+    return [
+        message["record"]
+        for message in messages
+        if message["type"] == "RECORD" and message["stream"] == stream
+    ]
+
+
+def states(messages: t.Iterable[dict]) -> t.List[dict]:
+    """Return the states written to `messages`."""
+    return [message["value"] for message in messages if message["type"] == "STATE"]
+
+
+def last_state(messages: t.Iterable[dict]) -> dict:
+    """Return the last state written to `messages`."""
+    return states(messages)[-1]
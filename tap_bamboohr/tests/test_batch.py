@@ -0,0 +1,45 @@
+"""Tests of the Parquet batch files of records."""
+from __future__ import annotations
+
+from urllib.parse import urlparse
+
+import pytest
+
+from tap_bamboohr.tests.helpers import base_config, sync
+
+REPORT = {"name": "report", "fields": ["firstName", "hireDate", "4001", "4002"]}
+
+
+def test_parquet_batches_have_typed_columns(tmp_path):
+    """Records are written to Parquet files with columns typed from the schema."""
+    pa = pytest.importorskip("pyarrow")
+    parquet = pytest.importorskip("pyarrow.parquet")
+    config = base_config(
+        20,
+        custom_reports=[REPORT],
+        report_field_metadata=True,
+        batch_config={
+            "encoding": {"format": "parquet"},
+            "storage": {"root": tmp_path.as_uri()},
+        },
+    )
+    messages = sync(config, streams=["employees", "report"])
+    assert not [message for message in messages if message["type"] == "RECORD"]
+    tables = {
+        message["stream"]: parquet.read_table(urlparse(message["manifest"][0]).path)
+        for message in messages
+        if message["type"] == "BATCH"
+    }
+    assert {name: table.num_rows for name, table in tables.items()} == {
+        "employees": 20,
+        "report": 20,
+    }
+    assert tables["employees"].schema.field("id").type == pa.string()
+    assert tables["employees"].schema.field("photoUploaded").type == pa.bool_()
+    report = tables["report"].schema
+    assert report.field("firstName").type == pa.string()
+    assert report.field("hireDate").type == pa.date32()
+    assert report.field("4001").type == pa.int64()
+    assert report.field("4002").type == pa.struct(
+        [("value", pa.float64()), ("currency", pa.string())]
+    )
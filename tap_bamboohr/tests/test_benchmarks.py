@@ -0,0 +1,41 @@
+"""Benchmarks of whole syncs of a synthetic account, and of replaying a recording.
+
+Run with `pytest --benchmark-only`, or skip them with `--benchmark-skip`.
+"""
+from __future__ import annotations
+
+import pytest
+
+from tap_bamboohr.tests.helpers import (
+    base_config,
+    build_tap,
+    cassette_config,
+    sync_output,
+)
+
+REPORT = {"name": "report", "fields": [str(4000 + field) for field in range(100)]}
+
+
+@pytest.mark.parametrize("fast_output", [False, True])
+@pytest.mark.parametrize("stream_responses", [False, True])
+def test_benchmark_sync(benchmark, fast_output, stream_responses):
+    """Time a sync of all streams and a wide custom report of 50 employees."""
+    config = base_config(
+        50,
+        custom_reports=[REPORT],
+        report_field_metadata=True,
+        fast_output=fast_output,
+        stream_responses=stream_responses,
+    )
+    output = benchmark(lambda: sync_output(build_tap(config)))
+    assert '"stream": "report"' in output
+
+
+@pytest.mark.usefixtures("synthetic_account")
+def test_benchmark_replay(benchmark, tmp_path):
+    """Time a sync replaying a recording."""
+    streams = ["employees", "photos_users", "photos", "tables_jobinfo"]
+    recorded = sync_output(build_tap(cassette_config(tmp_path), streams=streams))
+    config = cassette_config(tmp_path, http_cassette_mode="replay")
+    replayed = benchmark(lambda: sync_output(build_tap(config, streams=streams)))
+    assert len(replayed.splitlines()) == len(recorded.splitlines())
@@ -0,0 +1,96 @@
+"""Tests of the checkpoints of streams with child streams."""
+from __future__ import annotations
+
+import contextlib
+import io
+import typing as t
+
+import pytest
+
+from tap_bamboohr import tap as tap_module
+from tap_bamboohr.streams import Employees, TapBambooHRStream
+from tap_bamboohr.synthetic import SyntheticAdapter
+from tap_bamboohr.tests.helpers import (
+    base_config,
+    build_tap,
+    last_state,
+    parse_messages,
+    records,
+    sync,
+)
+
+STREAMS = ["photos_users", "photos"]
+
+
+def test_interrupted_sync_resumes_after_last_checkpoint(monkeypatch):
+    """An interrupted run is resumed from the children it last checkpointed."""
+    config = base_config(20, child_checkpoint_interval=5)
+    photo = SyntheticAdapter.photo
+
+    def failing_photo(self, request, query, employee_id):
+        if employee_id == "13":
+            raise RuntimeError("Interrupted")
+        return photo(self, request, query, employee_id)
+
+    monkeypatch.setattr(SyntheticAdapter, "photo", failing_photo)
+    output = io.StringIO()
+    with pytest.raises(RuntimeError), contextlib.redirect_stdout(output):
+        build_tap(config, streams=STREAMS).sync_all()
+    interrupted = parse_messages(output.getvalue())
+    state = last_state(interrupted)
+    checkpointed = state["bookmarks"]["photos_users"]["completed_children"]
+    assert sorted(checkpointed, key=int) == [str(number) for number in range(1, 11)]
+    assert len(records(interrupted, "photos")) == 12
+
+    monkeypatch.setattr(SyntheticAdapter, "photo", photo)
+    resumed = sync(config, streams=STREAMS, state=state)
+    assert len(records(resumed, "photos_users")) == 20
+    assert [record["_sdc_id"] for record in records(resumed, "photos")] == [
+        str(number) for number in range(11, 21)
+    ]
+    assert "completed_children" not in last_state(resumed)["bookmarks"]["photos_users"]
+
+
+def test_finished_sync_syncs_all_children_again():
+    """Checkpoints are forgotten once the parent stream finished syncing."""
+    config = base_config(20, child_checkpoint_interval=5)
+    first = sync(config, streams=STREAMS)
+    second = sync(config, streams=STREAMS, state=last_state(first))
+    assert len(records(first, "photos")) == 20
+    assert len(records(second, "photos")) == 20
+
+
+class EmployeeParents(Employees):
+    """Employees, with a child stream of their own."""
+
+    name = "employee_parents"
+
+    def get_child_context(self, record: dict, context: dict | None) -> dict:
+        return {"employee_id": record["id"]}
+
+
+class EmployeeChildren(TapBambooHRStream):
+    """One record for each employee, without requests."""
+
+    name = "employee_children"
+    primary_keys = ["employee_id"]
+    parent_stream_type = EmployeeParents
+    schema = {"properties": {"employee_id": {"type": "string"}}}
+
+    def get_records(self, context: dict | None) -> t.Iterable[dict]:
+        assert context is not None
+        yield {"employee_id": context["employee_id"]}
+
+
+def test_checkpoints_are_forgotten_by_any_parent(monkeypatch):
+    """Parents other than photos_users forget their checkpoints once finished."""
+    monkeypatch.setattr(tap_module, "STREAM_TYPES", [EmployeeParents, EmployeeChildren])
+    config = base_config(20, child_checkpoint_interval=5)
+    streams = ["employee_parents", "employee_children"]
+    first = sync(config, streams=streams)
+    assert (
+        "completed_children" not in last_state(first)["bookmarks"]["employee_parents"]
+    )
+    second = sync(config, streams=streams, state=last_state(first))
+    assert len(records(first, "employee_children")) == 20
+    assert len(records(second, "employee_children")) == 20
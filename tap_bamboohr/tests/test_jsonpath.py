@@ -0,0 +1,74 @@
+"""Tests of compiled JSONPath expressions against the SDK's `extract_jsonpath`."""
+from __future__ import annotations
+
+import pytest
+from singer_sdk.helpers.jsonpath import extract_jsonpath
+
+from tap_bamboohr.jsonpath import compile_jsonpath, parse_steps
+
+REPORT = {
+    "title": "Report",
+    "fields": [{"id": "firstName"}, {"id": "4001"}, {"name": "no id"}],
+    "employees": [
+        {"id": "1", "firstName": "Ada", "4001": None},
+        {"id": "2", "firstName": "Grace", "4001": "12.50 USD"},
+    ],
+}
+LISTS = [
+    {"alias": "jobTitle", "options": [{"id": 1}, {"id": 2}]},
+    {"alias": "department", "options": [{"id": 3}]},
+    {"alias": "location", "options": []},
+    "not an object",
+]
+DOCUMENTS = [REPORT, LISTS, [], {}, None, "text", [1, [2, 3], None], {"a": {"b": 1}}]
+EXPRESSIONS = [
+    "$",
+    "$.employees[*]",
+    "$.employees[*].firstName",
+    "$['employees'][*]['4001']",
+    "$.fields[*].id",
+    "$.missing[*]",
+    "$[*]",
+    "$[*][*]",
+    "$.a.b",
+    "$[?(@.alias=='jobTitle')].options[*]",
+    "$[?(@.alias!='jobTitle')].options[*].id",
+    '$[?(@.alias=="department")]',
+]
+
+
+@pytest.mark.parametrize("document", DOCUMENTS)
+@pytest.mark.parametrize("expression", EXPRESSIONS)
+def test_compiled_matches_sdk(expression, document):
+    """Compiled expressions match what the SDK matches, in the same order."""
+    assert parse_steps(expression) is not None
+    assert list(compile_jsonpath(expression)(document)) == list(
+        extract_jsonpath(expression, document)
+    )
+
+
+@pytest.mark.parametrize("expression", ["$..id", "$.employees[0]", "employees"])
+def test_other_expressions_fall_back_to_sdk(expression):
+    """Expressions that are not simple are extracted by the SDK."""
+    assert parse_steps(expression) is None
+    assert list(compile_jsonpath(expression)(REPORT)) == list(
+        extract_jsonpath(expression, REPORT)
+    )
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_benchmark_extract_records(benchmark, compiled):
+    """Time extracting the rows of a large custom report."""
+    report = {
+        "fields": [{"id": str(field)} for field in range(100)],
+        "employees": [
+            {str(field): index for field in range(100)} for index in range(5000)
+        ],
+    }
+    expression = "$.employees[*]"
+    extract = (
+        compile_jsonpath(expression)
+        if compiled
+        else lambda document: extract_jsonpath(expression, document)
+    )
+    assert benchmark(lambda: sum(1 for _ in extract(report))) == 5000
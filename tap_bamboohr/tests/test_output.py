@@ -0,0 +1,67 @@
+"""Tests of the fast output of RECORD messages."""
+from __future__ import annotations
+
+import contextlib
+import io
+import re
+from datetime import date, datetime, timezone
+from decimal import Decimal
+
+import pytest
+from singer_sdk._singerlib import RecordMessage
+from singer_sdk._singerlib.messages import format_message, write_message
+
+from tap_bamboohr import output
+from tap_bamboohr.tests.helpers import base_config, build_tap, sync_output
+
+TIME_EXTRACTED = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+TIME_EXTRACTED_PATTERN = re.compile(r', "time_extracted": "[^"]*"')
+RECORDS = [
+    {"id": "1", "name": 'Zoë "Z" O\'Brien', "emoji": "\U0001f600"},
+    {"id": 2, "rate": 65000.5, "active": True, "manager": None},
+    {"id": "3", "hired": date(2020, 1, 2), "changed": TIME_EXTRACTED},
+    {"id": "4", "rate": Decimal("65000.10"), "tags": ["a", {"b": 1.0}]},
+    {"id": "5", "nested": {"list": [1, 2.5, None, "x"], "empty": {}}},
+]
+
+
+@pytest.mark.parametrize("record", RECORDS)
+def test_record_messages_match_the_sdk(record, monkeypatch):
+    """RECORD messages are written exactly as the SDK formats them."""
+    monkeypatch.setattr(output, "utc_now", lambda: TIME_EXTRACTED)
+    written = io.StringIO()
+    with contextlib.redirect_stdout(written):
+        output.write_record_message("employees", record)
+    expected = format_message(
+        RecordMessage(stream="employees", record=record, time_extracted=TIME_EXTRACTED)
+    )
+    assert written.getvalue() == expected + "\n"
+
+
+def test_fast_output_matches_the_sdk_output():
+    """A sync with `fast_output` writes the same messages as one without."""
+    settings = {
+        "custom_reports": [
+            {"name": "report", "fields": ["firstName", "hireDate", "isPhotoUploaded"]}
+        ],
+        "report_field_metadata": True,
+    }
+    sdk = sync_output(build_tap(base_config(20, **settings)))
+    fast = sync_output(build_tap(base_config(20, fast_output=True, **settings)))
+    assert TIME_EXTRACTED_PATTERN.sub("", fast) == TIME_EXTRACTED_PATTERN.sub("", sdk)
+
+
+@pytest.mark.parametrize("fast_output", [False, True])
+def test_benchmark_record_messages(benchmark, fast_output):
+    """Time writing RECORD messages, with and without the fast output."""
+    record = {f"field{index}": f"value {index}" for index in range(50)}
+
+    def write_records() -> None:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(1000):
+                if fast_output:
+                    output.write_record_message("employees", record)
+                else:
+                    write_message(RecordMessage(stream="employees", record=record))
+
+    benchmark(write_records)
@@ -0,0 +1,29 @@
+"""Tests of the photos prefetched by photos_users."""
+from __future__ import annotations
+
+from tap_bamboohr.streams import PhotosUsers
+from tap_bamboohr.tests.helpers import (
+    base_config,
+    build_tap,
+    parse_messages,
+    records,
+    sync_output,
+)
+
+
+def test_photos_prefetched_but_not_synced_are_discarded(monkeypatch):
+    """Prefetched photos are dropped when the children of their record are skipped."""
+    sync_children = PhotosUsers._sync_children
+
+    def skip_employee_5(self, child_context):
+        if child_context is None or child_context["_sdc_id"] != "5":
+            sync_children(self, child_context)
+
+    monkeypatch.setattr(PhotosUsers, "_sync_children", skip_employee_5)
+    tap = build_tap(
+        base_config(20, photo_concurrency=4), streams=["photos_users", "photos"]
+    )
+    messages = parse_messages(sync_output(tap))
+    photos = [record["_sdc_id"] for record in records(messages, "photos")]
+    assert photos == [str(number) for number in range(1, 21) if number != 5]
+    assert tap.streams["photos"]._prefetched == {}
@@ -0,0 +1,88 @@
+"""Tests of the rate limiter shared by the streams of a tap."""
+from __future__ import annotations
+
+import threading
+
+import requests
+
+from tap_bamboohr.ratelimit import (
+    MIN_RATE,
+    THROTTLED_RATE,
+    RateLimiter,
+    retry_after_seconds,
+)
+
+
+def test_throttling_halves_the_rate():
+    """The rate is halved each time the API throttles a request."""
+    limiter = RateLimiter(8.0)
+    limiter.throttled()
+    assert limiter.rate == 4.0
+    for _ in range(20):
+        limiter.throttled()
+    assert limiter.rate == MIN_RATE
+
+
+def test_unlimited_rate_falls_back_when_throttled():
+    """An unlimited limiter falls back to a fixed rate when throttled."""
+    limiter = RateLimiter()
+    assert limiter.acquire() == 0.0
+    limiter.throttled()
+    assert limiter.rate == THROTTLED_RATE
+
+
+def test_successes_recover_the_rate():
+    """Each success raises the rate, up to the configured one."""
+    limiter = RateLimiter(8.0, recovery=1.0)
+    limiter.throttled()
+    for _ in range(3):
+        limiter.succeeded()
+    assert limiter.rate == 7.0
+    for _ in range(3):
+        limiter.succeeded()
+    assert limiter.rate == 8.0
+
+
+def test_consecutive_successes_restore_the_rate():
+    """The rate is restored once enough requests in a row went through."""
+    limiter = RateLimiter(recovery=0.1, restore_after=5)
+    limiter.throttled()
+    for _ in range(4):
+        limiter.succeeded()
+    limiter.throttled()
+    for _ in range(4):
+        limiter.succeeded()
+    assert limiter.rate is not None
+    limiter.succeeded()
+    assert limiter.rate is None
+
+
+def test_concurrent_successes_are_all_counted():
+    """Successes reported from several threads are all counted."""
+    limiter = RateLimiter(1000.0, recovery=1.0, restore_after=10_000)
+    for _ in range(10):
+        limiter.throttled()
+    rate = limiter.rate
+
+    def succeed() -> None:
+        for _ in range(100):
+            limiter.succeeded()
+
+    threads = [threading.Thread(target=succeed) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert limiter.rate == rate + 800
+
+
+def test_retry_after_seconds():
+    """Retry-After is read in both of its forms."""
+    response = requests.Response()
+    assert retry_after_seconds(response) is None
+    response.headers["Retry-After"] = "12"
+    assert retry_after_seconds(response) == 12.0
+    response.headers["Retry-After"] = "Wed, 21 Oct 2015 07:28:00 GMT"
+    assert retry_after_seconds(response) == 0.0
+    response.headers["Retry-After"] = "soon"
+    assert retry_after_seconds(response) is None
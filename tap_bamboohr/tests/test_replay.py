@@ -0,0 +1,105 @@
+"""Tests of recording responses, scrubbed of personal data, and replaying them."""
+from __future__ import annotations
+
+import json
+import re
+from datetime import date
+from pathlib import Path
+
+import pytest
+import requests
+
+from tap_bamboohr.replay import scrub_body, scrub_json, scrub_string
+from tap_bamboohr.synthetic import SyntheticAdapter
+from tap_bamboohr.tests.helpers import build_tap, cassette_config, sync_output
+
+KEY = b"key" * 8
+TIME_EXTRACTED_PATTERN = re.compile(r', "time_extracted": "[^"]*"')
+STREAMS = ["employees", "photos_users", "photos", "whos_out", "tables_jobinfo"]
+
+
+def recorded_bodies(directory: Path) -> str:
+    """Return the recorded response bodies, decoded as Latin-1."""
+    return "".join(path.read_text("latin-1") for path in directory.glob("*.body"))
+
+
+def test_scrubbed_values_keep_their_shape():
+    """Letters, digits and dates are replaced by values of the same shape."""
+    scrubbed = scrub_string("Ada Lovelace, ada@example.com +1 555-0100", KEY)
+    assert scrubbed != "Ada Lovelace, ada@example.com +1 555-0100"
+    assert re.fullmatch(
+        r"[A-Z][a-z]{2} [A-Z][a-z]{7}, [a-z]{3}@[a-z]{7}\.[a-z]{3} "
+        r"\+\d \d{3}-\d{4}",
+        scrubbed,
+    )
+    assert scrub_string("Ada", KEY) == scrub_string("Ada", KEY)
+    assert scrub_string("Ada", KEY) != scrub_string("Ada", b"other" * 8)
+    scrubbed_date = scrub_string("2024-02-29T10:00:00+00:00", KEY)
+    assert scrubbed_date.endswith("T10:00:00+00:00")
+    date.fromisoformat(scrubbed_date[:10])
+    assert scrub_string("0000-00-00", KEY) == "0000-00-00"
+
+
+def test_scrubbed_documents_keep_ids_and_fields():
+    """Ids, field names and types are kept, other values are scrubbed."""
+    document = {
+        "fields": [{"id": "firstName", "type": "text", "name": "First Name"}],
+        "employees": [
+            {"id": "1", "firstName": "Ada", "rate": 65000.5, "age": 36, "ok": True}
+        ],
+    }
+    scrubbed = scrub_json(document, KEY)
+    assert scrubbed["fields"] == document["fields"]
+    employee = scrubbed["employees"][0]
+    assert employee["id"] == "1"
+    assert employee["firstName"] != "Ada" and len(employee["firstName"]) == 3
+    assert isinstance(employee["rate"], float)
+    assert isinstance(employee["age"], int)
+    assert employee["ok"] is True
+
+
+def test_scrubbed_photos_keep_their_dimensions():
+    """Photos are replaced by a PNG header of the same dimensions."""
+    account = SyntheticAdapter("https://example.com", 1)
+    request = requests.Request("GET", "https://example.com/employees/1/photo/small")
+    _, headers, photo = account.photo(request.prepare(), {}, "1")
+    scrubbed = scrub_body(headers, photo, KEY)
+    assert len(scrubbed) < len(photo)
+    assert scrubbed == photo[: len(scrubbed)]
+
+
+@pytest.mark.usefixtures("synthetic_account")
+def test_replay_syncs_the_recorded_records(tmp_path):
+    """A replay syncs the records synced while recording, without personal data."""
+    recorded = sync_output(build_tap(cassette_config(tmp_path), streams=STREAMS))
+    replayed = sync_output(
+        build_tap(
+            cassette_config(tmp_path, http_cassette_mode="replay"), streams=STREAMS
+        )
+    )
+    assert '"stream": "photos"' in recorded
+    assert TIME_EXTRACTED_PATTERN.sub("", replayed) == TIME_EXTRACTED_PATTERN.sub(
+        "", recorded
+    )
+    bodies = recorded_bodies(tmp_path)
+    assert "employee1@example.com" not in bodies
+    assert "Employee 1" not in bodies
+    assert '"id": "1"' in bodies
+    for path in tmp_path.glob("*.json"):
+        assert "token" not in path.read_text()
+
+
+@pytest.mark.usefixtures("synthetic_account")
+def test_unscrubbed_recordings_hold_the_responses(tmp_path):
+    """Responses are recorded as they are when scrubbing is disabled."""
+    sync_output(
+        build_tap(
+            cassette_config(tmp_path, http_cassette_scrub=False), streams=["employees"]
+        )
+    )
+    (body,) = [
+        json.loads(path.read_bytes())
+        for path in tmp_path.glob("*.body")
+        if b"employees" in path.read_bytes()
+    ]
+    assert body["employees"][0]["workEmail"] == "employee1@example.com"
@@ -0,0 +1,89 @@
+"""Tests of the snapshot index, and of diffing full table streams against it."""
+from __future__ import annotations
+
+from tap_bamboohr.snapshot import SnapshotIndex
+from tap_bamboohr.streams import DELETED_AT_PROPERTY
+from tap_bamboohr.synthetic import SyntheticAdapter
+from tap_bamboohr.tests.helpers import base_config, build_tap, last_state, records, sync
+
+STREAMS = ["employees"]
+
+
+def test_index_tracks_changed_and_stale_keys(tmp_path):
+    """Keys are changed when new or rehashed, and stale when not seen by a run."""
+    index = SnapshotIndex(tmp_path, {"stream": "employees"})
+    assert index.update("1", b"a")
+    assert index.update("2", b"b")
+    index.commit()
+    assert index.generation == 1
+
+    assert not index.update("1", b"a")
+    assert index.update("3", b"c")
+    assert list(index.stale_keys()) == ["2"]
+    index.commit()
+    index.close()
+
+    reopened = SnapshotIndex(tmp_path, {"stream": "employees"})
+    assert reopened.generation == 2
+    assert not reopened.update("3", b"c")
+    assert reopened.update("1", b"changed")
+    assert list(reopened.stale_keys()) == []
+    reopened.close()
+
+
+def test_index_rolls_back_uncommitted_runs(tmp_path):
+    """Nothing is kept from a run that is not committed."""
+    index = SnapshotIndex(tmp_path, {"stream": "employees"})
+    index.update("1", b"a")
+    index.close()
+
+    reopened = SnapshotIndex(tmp_path, {"stream": "employees"})
+    assert reopened.generation == 0
+    assert reopened.update("1", b"a")
+    reopened.close()
+
+
+def test_unchanged_records_are_left_out(tmp_path):
+    """A second run confirmed by the state emits no unchanged records."""
+    config = base_config(20, snapshot_diff_dir=str(tmp_path))
+    first = sync(config, streams=STREAMS)
+    second = sync(config, streams=STREAMS, state=last_state(first))
+    assert len(records(first, "employees")) == 20
+    assert records(second, "employees") == []
+
+
+def test_unconfirmed_state_emits_all_records(tmp_path):
+    """Records are emitted again when the state does not confirm the last run."""
+    config = base_config(20, snapshot_diff_dir=str(tmp_path))
+    sync(config, streams=STREAMS)
+    second = sync(config, streams=STREAMS)
+    assert len(records(second, "employees")) == 20
+
+
+def test_deleted_records_are_marked(tmp_path, monkeypatch):
+    """Records no longer returned are emitted with their key and deletion time."""
+    config = base_config(
+        20, snapshot_diff_dir=str(tmp_path), snapshot_diff_deletes=True
+    )
+    first = sync(config, streams=STREAMS)
+    monkeypatch.setattr(SyntheticAdapter, "employee_ids", lambda self: range(1, 16))
+    second = sync(config, streams=STREAMS, state=last_state(first))
+    deleted = records(second, "employees")
+    assert sorted(record["id"] for record in deleted) == ["16", "17", "18", "19", "20"]
+    assert all(record[DELETED_AT_PROPERTY] for record in deleted)
+
+
+def test_catalog_without_keys_disables_diff(tmp_path):
+    """Streams whose catalog clears their key properties are not diffed."""
+    config = base_config(
+        20, snapshot_diff_dir=str(tmp_path), snapshot_diff_deletes=True
+    )
+    key_properties = {"employees": []}
+    stream = build_tap(config, key_properties=key_properties).streams["employees"]
+    assert DELETED_AT_PROPERTY not in stream.schema["properties"]
+
+    first = sync(config, streams=STREAMS, key_properties=key_properties)
+    second = sync(
+        config, streams=STREAMS, state=last_state(first), key_properties=key_properties
+    )
+    assert len(records(second, "employees")) == 20
@@ -0,0 +1,15 @@
+"""Tests of the employee table streams generated from the table metadata."""
+from __future__ import annotations
+
+from tap_bamboohr.streams import GenericEmployeeTable
+from tap_bamboohr.tests.helpers import base_config, build_tap
+
+
+def test_generated_tables_are_keyed_by_employee_and_date():
+    """Generated tables are keyed by `employee_id` and their first date field."""
+    tap = build_tap(base_config(5, employee_tables=["compensation"]))
+    stream = tap.streams["tables_compensation"]
+    assert stream.primary_keys == ["employee_id", "startDate"]
+    assert stream.replication_key == "lastChanged"
+    undated = {"alias": "notes", "fields": [{"alias": "note", "type": "text"}]}
+    assert GenericEmployeeTable.table_keys(undated) == ["employee_id"]
@@ -0,0 +1,58 @@
+"""Tests of the date windows of the time off streams."""
+from __future__ import annotations
+
+import pytest
+
+from tap_bamboohr.tests.helpers import base_config, last_state, records, states, sync
+
+STREAMS = ["whos_out", "time_off_requests"]
+
+
+@pytest.mark.parametrize("concurrency", [1, 3])
+def test_windows_return_each_record_once(concurrency):
+    """Records overlapping several windows are only synced once."""
+    whole = sync(base_config(20), streams=STREAMS)
+    windowed = sync(
+        base_config(20, time_off_window_months=1, time_off_concurrency=concurrency),
+        streams=STREAMS,
+    )
+    requests = records(whole, "time_off_requests")
+    assert any(record["start"][:7] != record["end"][:7] for record in requests)
+    for stream in STREAMS:
+        whole_records = records(whole, stream)
+        windowed_records = records(windowed, stream)
+        assert sorted(whole_records, key=str) == sorted(windowed_records, key=str)
+
+
+def test_holidays_are_kept_apart_from_time_off():
+    """Holidays numbered like time off are not taken for duplicates."""
+    messages = sync(base_config(20, time_off_window_months=6), streams=["whos_out"])
+    whos_out = records(messages, "whos_out")
+    holidays = {record["id"] for record in whos_out if record["type"] == "holiday"}
+    time_off = {record["id"] for record in whos_out if record["type"] == "timeOff"}
+    assert len(holidays) == 24
+    assert holidays & time_off
+    assert len(whos_out) == len(holidays) + len(time_off)
+
+
+@pytest.mark.parametrize("parallel_streams", [1, 2])
+def test_window_progress_is_saved(parallel_streams):
+    """The progress through the windows is saved after each window."""
+    config = base_config(
+        20,
+        time_off_window_months=6,
+        time_off_lookback_days=30,
+        parallel_streams=parallel_streams,
+    )
+    messages = sync(config, streams=STREAMS)
+    synced_through = [
+        state["bookmarks"]["whos_out"]["window_progress"]["synced_through"]
+        for state in states(messages)
+        if "window_progress" in state.get("bookmarks", {}).get("whos_out", {})
+    ]
+    assert len(synced_through) > 1
+    assert synced_through == sorted(synced_through)
+    bookmarks = last_state(messages)["bookmarks"]
+    for stream in STREAMS:
+        assert "window_progress" not in bookmarks[stream]
+        assert "synced_through" in bookmarks[stream]